@@ -0,0 +1,75 @@
+# tests/test_agent_utils_optional_tools.py
+"""
+agent_utils 可选工具组测试：量化工具模块缺失或导入失败时，对应名字不应被导出为 None
+"""
+import importlib
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tradingagents.agents.utils import agent_utils
+
+
+QUANT_MODULE = "tradingagents.agents.utils.quant_data_tools"
+QUANT_TOOLS = ("get_risk_metrics_data", "get_volatility_data", "simple_forex_data")
+
+
+@pytest.fixture
+def reload_agent_utils():
+    """
+    清除上次加载留下的量化工具名（reload 复用同一个模块字典），
+    并在 monkeypatch 撤销后按真实环境重新加载 agent_utils
+    """
+    for name in QUANT_TOOLS:
+        agent_utils.__dict__.pop(name, None)
+    yield
+    agent_utils.OPTIONAL_TOOLS.clear()
+    importlib.reload(agent_utils)
+
+
+def _assert_quant_tools_absent():
+    for name in QUANT_TOOLS:
+        assert not hasattr(agent_utils, name)
+        assert name not in agent_utils.__all__
+        assert name not in agent_utils.OPTIONAL_TOOLS
+    for name in agent_utils.__all__:
+        assert getattr(agent_utils, name) is not None, name
+
+
+def test_quant_tools_exported_when_available():
+    for name in QUANT_TOOLS:
+        assert name in agent_utils.__all__
+        assert getattr(agent_utils, name) is agent_utils.OPTIONAL_TOOLS[name]
+
+
+def test_missing_quant_module_leaves_names_unexported(reload_agent_utils, monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec",
+                        lambda name, *args: None if name == QUANT_MODULE else find_spec(name, *args))
+    agent_utils.OPTIONAL_TOOLS.clear()
+    importlib.reload(agent_utils)
+
+    _assert_quant_tools_absent()
+    with pytest.raises(ImportError):
+        exec("from tradingagents.agents.utils.agent_utils import simple_forex_data", {})
+
+
+def test_failed_quant_import_leaves_names_unexported(reload_agent_utils, monkeypatch):
+    import_module = importlib.import_module
+
+    def failing_import(name, *args):
+        if name == QUANT_MODULE:
+            raise ImportError("simulated failure")
+        return import_module(name, *args)
+
+    monkeypatch.setattr(importlib, "import_module", failing_import)
+    agent_utils.OPTIONAL_TOOLS.clear()
+    importlib.reload(agent_utils)
+
+    _assert_quant_tools_absent()
+    # 宏观工具组不受影响
+    assert {"get_fred_data", "get_ecb_data", "get_macro_dashboard"} <= set(agent_utils.__all__)
@@ -0,0 +1,51 @@
+# tests/test_cache_manager.py
+"""
+缓存管理工具测试：缓存目录遍历只统计普通 .pkl 文件，遍历期间被删除的文件不会导致异常
+"""
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tradingagents.agents.utils import cache_manager
+
+
+def test_iter_cache_files_keeps_only_regular_pkl_files(tmp_path):
+    (tmp_path / "a.pkl").write_bytes(b"a")
+    (tmp_path / "b.pkl").write_bytes(b"bb")
+    (tmp_path / ".hidden.pkl").write_bytes(b"x")
+    (tmp_path / "notes.txt").write_bytes(b"x")
+    (tmp_path / "folder.pkl").mkdir()
+
+    found = {os.path.basename(path): stat.st_size
+             for path, stat in cache_manager._iter_cache_files(str(tmp_path))}
+    assert found == {"a.pkl": 1, "b.pkl": 2}
+
+
+def test_iter_cache_files_skips_files_removed_during_scan(tmp_path, monkeypatch):
+    for name in ("a.pkl", "gone.pkl", "c.pkl"):
+        (tmp_path / name).write_bytes(b"x")
+
+    real_scandir = os.scandir
+
+    class RemovingScandir:
+        """遍历到 gone.pkl 之前先把它删除，模拟并发清理"""
+        def __init__(self, path):
+            self._it = real_scandir(path)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._it.close()
+
+        def __iter__(self):
+            for entry in self._it:
+                if entry.name == "gone.pkl":
+                    os.remove(entry.path)
+                yield entry
+
+    monkeypatch.setattr(cache_manager.os, "scandir", RemovingScandir)
+    found = sorted(os.path.basename(path) for path, _ in cache_manager._iter_cache_files(str(tmp_path)))
+    assert found == ["a.pkl", "c.pkl"]
@@ -0,0 +1,73 @@
+# tests/test_news_vendor_circuit.py
+"""
+新闻vendor超时熔断测试：熔断按 (vendor, 货币对) 隔离，一个货币对超时不影响其他货币对
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tradingagents.agents.utils import news_data_tools
+
+
+SLOW_TICKER = "EUR/USD"
+
+
+@pytest.fixture
+def vendor(monkeypatch):
+    """EUR/USD 的请求一直挂起直到测试结束，其余货币对立即返回；记录每次vendor调用"""
+    release = threading.Event()
+    calls = []
+
+    def fake_route_to_vendor(method, **params):
+        calls.append(params.get("ticker"))
+        if params.get("ticker") == SLOW_TICKER:
+            release.wait(5)
+        return {"ticker": params.get("ticker"), "items": []}
+
+    monkeypatch.setattr(news_data_tools, "route_to_vendor", fake_route_to_vendor)
+    monkeypatch.setattr(news_data_tools, "_news_vendor_timeout", lambda: 0.2)
+    monkeypatch.setattr(news_data_tools, "_resolve_primary_vendor", lambda: "alpha_vantage")
+    monkeypatch.setattr(news_data_tools, "_circuit_open_until", {})
+    yield calls
+    release.set()
+
+
+def test_timeout_opens_circuit_only_for_its_key(vendor):
+    with pytest.raises(news_data_tools.NewsVendorTimeout, match="vendor_timeout"):
+        news_data_tools._call_vendor_with_timeout({"ticker": SLOW_TICKER})
+
+    # 同一货币对处于熔断期，不再请求vendor
+    with pytest.raises(news_data_tools.NewsVendorTimeout, match="circuit_open"):
+        news_data_tools._call_vendor_with_timeout({"ticker": SLOW_TICKER})
+    assert vendor.count(SLOW_TICKER) == 1
+
+    # 其他货币对不受影响
+    for ticker in ("USD/JPY", "GBP/USD"):
+        assert news_data_tools._call_vendor_with_timeout({"ticker": ticker})["ticker"] == ticker
+    assert list(news_data_tools._circuit_open_until) == [("alpha_vantage", SLOW_TICKER)]
+
+
+def test_circuit_is_keyed_by_vendor(vendor, monkeypatch):
+    with pytest.raises(news_data_tools.NewsVendorTimeout, match="vendor_timeout"):
+        news_data_tools._call_vendor_with_timeout({"ticker": SLOW_TICKER})
+
+    # 切换vendor后同一货币对重新请求（不处于熔断期）
+    monkeypatch.setattr(news_data_tools, "_resolve_primary_vendor", lambda: "openai")
+    with pytest.raises(news_data_tools.NewsVendorTimeout, match="vendor_timeout"):
+        news_data_tools._call_vendor_with_timeout({"ticker": SLOW_TICKER})
+    assert vendor.count(SLOW_TICKER) == 2
+
+
+def test_vendor_calls_do_not_use_shared_executor(vendor, monkeypatch):
+    from tradingagents.agents.utils import SHARED_EXECUTOR
+
+    def fail_submit(*args, **kwargs):
+        raise AssertionError("news vendor call submitted to SHARED_EXECUTOR")
+
+    monkeypatch.setattr(SHARED_EXECUTOR, "submit", fail_submit)
+    assert news_data_tools._call_vendor_with_timeout({"ticker": "USD/JPY"})["ticker"] == "USD/JPY"
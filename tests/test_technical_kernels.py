@@ -0,0 +1,209 @@
+# tests/test_technical_kernels.py
+"""
+技术指标各计算路径的一致性测试
+
+technical_indicators_tools 按安装情况选择 numba 内核、scipy lfilter、TA-Lib 或纯 pandas 实现，
+这里逐一强制每条路径，与独立编写的 pandas 参考实现对比，防止某条路径单独改动后结果悄悄分叉。
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tradingagents.agents.utils import _kernels
+from tradingagents.agents.utils import technical_indicators_tools as tech
+
+
+LENGTHS = (25, 60, 300, 2000)
+KINDS = ("trend", "nan", "flat")
+PATHS = ("numba", "lfilter", "talib", "pandas")
+
+# 各指标列开头的 NaN 个数（无缺失值的输入）
+LEADING_NAN = {
+    "RSI": 14,
+    "MACD": 0, "MACD_Signal": 0, "MACD_Histogram": 0,
+    **{f"SMA_{period}": period - 1 for period in tech.MA_PERIODS},
+    **{f"EMA_{period}": 0 for period in tech.MA_PERIODS},
+    "BB_Upper": 19, "BB_Middle": 19, "BB_Lower": 19, "BB_Width": 19, "BB_Position": 19,
+    "Stoch_K": 13, "Stoch_D": 15,
+    "ATR": 14,
+}
+
+
+def make_ohlc(n: int, kind: str) -> pd.DataFrame:
+    """生成确定性的 OHLC 数据：随机游走 / 含 NaN 的随机游走 / 水平价格"""
+    rng = np.random.default_rng(n)
+    if kind == "flat":
+        close = np.full(n, 1.1)
+        high = close.copy()
+        low = close.copy()
+    else:
+        close = 1.1 + np.cumsum(rng.standard_normal(n)) * 1e-3
+        high = close + rng.random(n) * 2e-3
+        low = close - rng.random(n) * 2e-3
+        if kind == "nan":
+            for column, positions in ((close, (3, n // 2)), (high, (n // 2 + 1,)), (low, (n - 2,))):
+                column[list(positions)] = np.nan
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close})
+
+
+# ---------- pandas 参考实现 ----------
+
+def wilder_reference(values: pd.Series, period: int) -> pd.Series:
+    """Wilder 平滑：首个完整窗口的简单均值作种子，之后 alpha=1/period 递推"""
+    seed = values.rolling(period).mean()
+    start = seed.first_valid_index()
+    if start is None:
+        return pd.Series(np.nan, index=values.index)
+    seeded = values.copy()
+    seeded.loc[:start] = np.nan
+    seeded.loc[start] = seed.loc[start]
+    return seeded.ewm(alpha=1 / period, adjust=False).mean()
+
+
+def reference_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    close, high, low = df["close"], df["high"], df["low"]
+    out = {}
+
+    delta = close.diff()
+    avg_gain = wilder_reference(delta.clip(lower=0), 14)
+    avg_loss = wilder_reference((-delta).clip(lower=0), 14)
+    out["RSI"] = 100 - 100 / (1 + avg_gain / avg_loss)
+
+    macd = (close.ewm(span=12, adjust=False).mean()
+            - close.ewm(span=26, adjust=False).mean())
+    signal = macd.ewm(span=9, adjust=False).mean()
+    out["MACD"], out["MACD_Signal"], out["MACD_Histogram"] = macd, signal, macd - signal
+
+    for period in tech.MA_PERIODS:
+        out[f"SMA_{period}"] = close.rolling(period).mean()
+        out[f"EMA_{period}"] = close.ewm(span=period, adjust=False).mean()
+
+    middle = close.rolling(20).mean()
+    std = close.rolling(20).std(ddof=1)
+    upper, lower = middle + 2 * std, middle - 2 * std
+    out.update(BB_Upper=upper, BB_Middle=middle, BB_Lower=lower,
+               BB_Width=(upper - lower) / middle, BB_Position=(close - lower) / (upper - lower))
+
+    low_min = low.rolling(14).min()
+    high_max = high.rolling(14).max()
+    stoch_k = 100 * (close - low_min) / (high_max - low_min)
+    out["Stoch_K"], out["Stoch_D"] = stoch_k, stoch_k.rolling(3).mean()
+
+    prev_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()],
+                           axis=1).max(axis=1, skipna=False)
+    out["ATR"] = wilder_reference(true_range, 14)
+
+    return pd.DataFrame(out)[list(tech.INDICATOR_COLUMNS)]
+
+
+# ---------- 强制计算路径 ----------
+
+@pytest.fixture(params=PATHS)
+def path(request, monkeypatch):
+    """把 technical_indicators_tools 切换到指定计算路径"""
+    name = request.param
+    if name == "numba" and not _kernels.NUMBA_AVAILABLE:
+        pytest.skip("numba 未安装")
+    if name == "lfilter" and tech._lfilter is None:
+        pytest.skip("scipy 未安装")
+    if name == "talib" and tech._talib is None:
+        pytest.skip("TA-Lib 未安装")
+
+    monkeypatch.setattr(tech, "NUMBA_AVAILABLE", name == "numba")
+    if name != "lfilter":
+        monkeypatch.setattr(tech, "_lfilter", None)
+    if name != "talib":
+        monkeypatch.setattr(tech, "_talib", None)
+    return name
+
+
+def assert_columns_close(result: pd.DataFrame, expected: pd.DataFrame, columns) -> None:
+    for column in columns:
+        np.testing.assert_allclose(result[column].to_numpy(), expected[column].to_numpy(),
+                                   rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=column)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.parametrize("n", LENGTHS)
+def test_all_indicators_match_pandas_reference(path, n, kind):
+    df = make_ohlc(n, kind)
+    result = tech.calculate_all_indicators(df)
+    assert_columns_close(result, reference_indicators(df), tech.INDICATOR_COLUMNS)
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+def test_public_calculators_match_pandas_reference(path, n):
+    df = make_ohlc(n, "nan")
+    expected = reference_indicators(df)
+    result = pd.DataFrame({"RSI": tech.calculate_rsi(df), "ATR": tech.calculate_atr(df)})
+    result["MACD"], result["MACD_Signal"], result["MACD_Histogram"] = tech.calculate_macd(df)
+    result["BB_Upper"], result["BB_Middle"], result["BB_Lower"] = tech.calculate_bollinger_bands(df)
+    result["Stoch_K"], result["Stoch_D"] = tech.calculate_stochastic(df)
+    assert_columns_close(result, expected, result.columns)
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+def test_leading_nan_counts(path, n):
+    result = tech.calculate_all_indicators(make_ohlc(n, "trend"))
+    for column, expected in LEADING_NAN.items():
+        values = result[column].to_numpy()
+        assert np.isnan(values[:expected]).all(), column
+        if n > expected:
+            assert not np.isnan(values[expected:]).any(), column
+
+
+def test_wilder_rsi_and_atr_use_sma_seed(path):
+    """RSI/ATR 为 TA-Lib 口径：首个值是前 14 个增量的简单均值，而不是从首行开始的 EWM"""
+    df = make_ohlc(60, "trend")
+    close, high, low = (df[column].to_numpy() for column in ("close", "high", "low"))
+
+    delta = np.diff(close)
+    gains, losses = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+    prev_close = close[:-1]
+    true_range = np.maximum.reduce([high[1:] - low[1:], np.abs(high[1:] - prev_close),
+                                    np.abs(low[1:] - prev_close)])
+
+    avg_gain, avg_loss, atr = gains[:14].mean(), losses[:14].mean(), true_range[:14].mean()
+    expected_rsi, expected_atr = [100 - 100 / (1 + avg_gain / avg_loss)], [atr]
+    for gain, loss, tr in zip(gains[14:], losses[14:], true_range[14:]):
+        avg_gain = (avg_gain * 13 + gain) / 14
+        avg_loss = (avg_loss * 13 + loss) / 14
+        atr = (atr * 13 + tr) / 14
+        expected_rsi.append(100 - 100 / (1 + avg_gain / avg_loss))
+        expected_atr.append(atr)
+
+    np.testing.assert_allclose(tech.calculate_rsi(df).to_numpy()[14:], expected_rsi, rtol=1e-9)
+    np.testing.assert_allclose(tech.calculate_atr(df).to_numpy()[14:], expected_atr, rtol=1e-9)
+
+    # 旧口径（alpha=1/14 的 EWM，从第二行起算）在种子附近明显不同
+    old_rsi = pd.Series(gains).ewm(alpha=1 / 14, adjust=False).mean()
+    old_rsi = 100 - 100 / (1 + old_rsi / pd.Series(losses).ewm(alpha=1 / 14, adjust=False).mean())
+    assert abs(old_rsi.iloc[13] - expected_rsi[0]) > 1e-6
+
+
+@pytest.mark.parametrize("compiled", (True, False))
+@pytest.mark.parametrize("n", LENGTHS)
+def test_fill_nan_forward_backward_matches_pandas(n, compiled):
+    if compiled and not _kernels.NUMBA_AVAILABLE:
+        pytest.skip("numba 未安装")
+    fill = _kernels.fill_nan_forward_backward
+    if not compiled:
+        fill = getattr(fill, "py_func", fill)
+
+    rng = np.random.default_rng(n)
+    block = rng.standard_normal((n, 4))
+    block[rng.random((n, 4)) < 0.2] = np.nan
+    block[:3, 1] = np.nan
+    block[-3:, 2] = np.nan
+    block[:, 3] = np.nan
+
+    expected = pd.DataFrame(block).ffill().bfill().to_numpy()
+    result = fill(np.ascontiguousarray(block.copy()))
+    np.testing.assert_array_equal(result, expected)
@@ -3,31 +3,48 @@
 避免循环导入问题
 """
 
+import atexit
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# 全局共享线程池（工具调用以网络IO为主，按CPU数的4倍设置上限）
+# 必须在导入各工具模块之前定义，工具模块会在导入时引用它
+SHARED_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(16, (os.cpu_count() or 4) * 4),
+    thread_name_prefix="ta-tools"
+)
+atexit.register(SHARED_EXECUTOR.shutdown, wait=False)
+
 # 使用延迟导入避免循环依赖
 # 不在这里导入 route_to_vendor，而是让每个模块自己导入
 
 # 导出技术指标工具
 from .technical_indicators_tools import (
     get_technical_data,
+    get_technical_data_batch,
     get_technical_indicators_data,
+    get_technical_indicators_data_batch,
     get_fibonacci_levels,
-    get_indicators
+    get_indicators,
+    get_indicators_structured
 )
 
 # 导出新闻工具
 from .news_data_tools import (
     get_news,
     get_news_direct,
+    aget_news,
+    prime_news_cache,
     optimize_parameters_for_vendor
 )
 
 # 导出外汇工具
 from .core_forex_tools import (
-    get_forex_data
+    get_forex_data,
+    aget_forex_data
 )
 
 # 导出量化工具（如果可用）
@@ -65,6 +82,35 @@ def import_route_to_vendor():
         logger.error(f"导入 route_to_vendor 失败: {e}")
         raise
 
+def warmup():
+    """
+    预热技术指标计算路径
+
+    在服务启动时调用一次（例如 `from tradingagents.agents.utils import warmup; warmup()`），
+    用一组长度为32的虚拟价格数据触发所有指标函数，使首个真实请求不再承担
+    一次性初始化开销。结果直接丢弃。
+    """
+    import numpy as np
+    import pandas as pd
+    from .technical_indicators_tools import (
+        calculate_all_indicators,
+        calculate_fibonacci_levels
+    )
+
+    close = np.linspace(1.0, 1.1, 32, dtype=np.float64)
+    dummy = pd.DataFrame({
+        "open": close,
+        "high": close * 1.001,
+        "low": close * 0.999,
+        "close": close
+    })
+
+    with np.errstate(all="ignore"):
+        calculate_all_indicators(dummy)
+        calculate_fibonacci_levels(dummy, 32)
+
+    logger.info("技术指标计算路径预热完成")
+
 # 提供常用工具列表
 TOOLS = {
     "technical": [get_technical_indicators_data, get_fibonacci_levels, get_indicators],
@@ -0,0 +1,546 @@
+"""
+技术指标数值内核
+安装 numba 时编译为机器码；未安装时 NUMBA_AVAILABLE 为 False，调用方回退到 pandas 实现
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 不可用时的空装饰器"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# 注意：内核需要正确处理 NaN，因此不启用 fastmath（其 nnan 假设会破坏 NaN 判断）
+@njit(cache=True, nogil=True)
+def ewm_adjust_false(values, alpha, min_periods):
+    """
+    指数加权移动平均，逐元素结果与 pandas ewm(alpha=alpha, adjust=False).mean() 一致
+
+    y[i] = (1 - alpha) * y[i-1] + alpha * x[i]；
+    开头的 NaN 被跳过，中间的 NaN 保持上一个值并让旧权重继续衰减。
+    """
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    minp = max(min_periods, 1)
+    old_wt_factor = 1.0 - alpha
+    new_wt = alpha
+
+    weighted = values[0] if n > 0 else np.nan
+    is_observation = weighted == weighted
+    nobs = 1 if is_observation else 0
+    old_wt = 1.0
+    if n > 0:
+        out[0] = weighted if nobs >= minp else np.nan
+
+    for i in range(1, n):
+        cur = values[i]
+        is_observation = cur == cur
+        if is_observation:
+            nobs += 1
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted if nobs >= minp else np.nan
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ewm_step(weighted, old_wt, x, alpha):
+    """ewm_adjust_false（min_periods<=1）的单步递推，返回更新后的 (weighted, old_wt)"""
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if x == x:
+            if weighted != x:
+                weighted = (old_wt * weighted + alpha * x) / (old_wt + alpha)
+            old_wt = 1.0
+    elif x == x:
+        weighted = x
+    return weighted, old_wt
+
+
+@njit(cache=True, nogil=True)
+def macd(close, fast, slow, signal):
+    """
+    MACD线、信号线、柱状图，单次遍历同时推进快线、慢线与信号线三条 EMA
+
+    逐元素结果与分别调用 ewm_adjust_false 后相减一致。
+    """
+    n = close.shape[0]
+    macd_line = np.empty(n, dtype=np.float64)
+    signal_line = np.empty(n, dtype=np.float64)
+    histogram = np.empty(n, dtype=np.float64)
+    alpha_fast = 2.0 / (fast + 1.0)
+    alpha_slow = 2.0 / (slow + 1.0)
+    alpha_signal = 2.0 / (signal + 1.0)
+    fast_ema = np.nan
+    slow_ema = np.nan
+    signal_ema = np.nan
+    fast_wt = 1.0
+    slow_wt = 1.0
+    signal_wt = 1.0
+
+    for i in range(n):
+        x = close[i]
+        fast_ema, fast_wt = _ewm_step(fast_ema, fast_wt, x, alpha_fast)
+        slow_ema, slow_wt = _ewm_step(slow_ema, slow_wt, x, alpha_slow)
+        m = fast_ema - slow_ema
+        signal_ema, signal_wt = _ewm_step(signal_ema, signal_wt, m, alpha_signal)
+        macd_line[i] = m
+        signal_line[i] = signal_ema
+        histogram[i] = m - signal_ema
+
+    return macd_line, signal_line, histogram
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean(values, window):
+    """
+    滑动窗口均值，结果与 pandas rolling(window).mean() 一致
+
+    使用 V[t] = V[t-1] + (x[t] - x[t-window]) / window 的增量递推，O(n) 与窗口长度无关；
+    累加和采用 Kahan 补偿以抑制长序列上的舍入误差。
+    窗口内含 NaN 或 ±inf 时结果为 NaN（pandas rolling 会先把 inf 视为 NaN）。
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    compensation = 0.0
+    nan_count = 0
+
+    for i in range(n):
+        x = values[i]
+        if np.isfinite(x):
+            y = x - compensation
+            t = total + y
+            compensation = (t - total) - y
+            total = t
+        else:
+            nan_count += 1
+
+        if i >= window:
+            old = values[i - window]
+            if np.isfinite(old):
+                y = -old - compensation
+                t = total + y
+                compensation = (t - total) - y
+                total = t
+            else:
+                nan_count -= 1
+
+        if i >= window - 1 and nan_count == 0:
+            out[i] = total / window
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def wilder_rma(values, period):
+    """
+    Wilder 平滑（RMA），与 TA-Lib 的 RSI/ATR 口径一致
+
+    以首个不含 NaN 的完整窗口的简单均值为种子，之后按
+    avg[i] = avg[i-1] + (x[i] - avg[i-1]) / period 递推（即 alpha=1/period 的 adjust=False 指数平均）。
+    种子之前的位置为 NaN；种子之后的 NaN 沿用 ewm_adjust_false 的处理方式。
+    """
+    n = values.shape[0]
+    seed = rolling_mean(values, period)
+    start = -1
+    for i in range(n):
+        if seed[i] == seed[i]:
+            start = i
+            break
+    seeded = np.full(n, np.nan)
+    if start < 0:
+        return seeded
+    seeded[start] = seed[start]
+    for i in range(start + 1, n):
+        seeded[i] = values[i]
+    return ewm_adjust_false(seeded, 1.0 / period, 1)
+
+
+@njit(cache=True, nogil=True)
+def rsi(close, period):
+    """RSI：单次遍历得到涨跌幅，再做 Wilder 平滑（与 calculate_rsi 的 pandas 路径一致）"""
+    n = close.shape[0]
+    gain = np.empty(n, dtype=np.float64)
+    loss = np.empty(n, dtype=np.float64)
+    if n > 0:
+        gain[0] = np.nan
+        loss[0] = np.nan
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta != delta:
+            gain[i] = np.nan
+            loss[i] = np.nan
+        elif delta > 0:
+            gain[i] = delta
+            loss[i] = 0.0
+        else:
+            gain[i] = 0.0
+            loss[i] = -delta
+
+    avg_gain = wilder_rma(gain, period)
+    avg_loss = wilder_rma(loss, period)
+
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        g = avg_gain[i]
+        l = avg_loss[i]
+        if l == 0.0:
+            # 与 numpy 除零语义一致：g>0 时 rs=inf → 100；g==0 时 rs=nan
+            out[i] = 100.0 if g > 0 else np.nan
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + g / l)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def true_range(high, low, close):
+    """真实波幅，首行因缺少前收盘价为 NaN；任一输入为 NaN 时结果为 NaN"""
+    n = close.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n > 0:
+        out[0] = np.nan
+    for i in range(1, n):
+        prev_close = close[i - 1]
+        hl = high[i] - low[i]
+        hc = abs(high[i] - prev_close)
+        lc = abs(low[i] - prev_close)
+        if hl != hl or hc != hc or lc != lc:
+            out[i] = np.nan
+        else:
+            out[i] = max(hl, hc, lc)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def atr(high, low, close, period):
+    """平均真实波幅：真实波幅的 Wilder 平滑"""
+    return wilder_rma(true_range(high, low, close), period)
+
+
+@njit(cache=True, nogil=True)
+def bollinger(close, period, num_std):
+    """
+    布林带（上轨、中轨、下轨），标准差为样本标准差（ddof=1），与 pandas rolling().std() 一致
+
+    用 Welford 增量算法维护窗口均值与离差平方和，避免 sum_sq/n - mean² 在价格量级上的精度损失。
+    """
+    n = close.shape[0]
+    upper = np.full(n, np.nan)
+    middle = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    nobs = 0
+    nan_count = 0
+    mean = 0.0
+    ssqdm = 0.0
+
+    for i in range(n):
+        x = close[i]
+        if x == x:
+            nobs += 1
+            delta = x - mean
+            mean += delta / nobs
+            ssqdm += delta * (x - mean)
+        else:
+            nan_count += 1
+
+        if i >= period:
+            old = close[i - period]
+            if old == old:
+                nobs -= 1
+                if nobs > 0:
+                    delta = old - mean
+                    mean -= delta / nobs
+                    ssqdm -= delta * (old - mean)
+                else:
+                    mean = 0.0
+                    ssqdm = 0.0
+            else:
+                nan_count -= 1
+
+        if i >= period - 1 and nan_count == 0:
+            middle[i] = mean
+            if nobs > 1:
+                variance = ssqdm / (nobs - 1)
+                std = np.sqrt(variance) if variance > 0 else 0.0
+                upper[i] = mean + std * num_std
+                lower[i] = mean - std * num_std
+
+    return upper, middle, lower
+
+
+@njit(cache=True, nogil=True)
+def rolling_extreme(values, window, find_max):
+    """
+    滑动窗口最大值/最小值，使用单调队列，O(n)
+
+    结果与 pandas rolling(window).max()/min() 一致：窗口内含 NaN 时为 NaN。
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    queue = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    nan_count = 0
+
+    for i in range(n):
+        x = values[i]
+        if x == x:
+            if find_max:
+                while tail > head and values[queue[tail - 1]] <= x:
+                    tail -= 1
+            else:
+                while tail > head and values[queue[tail - 1]] >= x:
+                    tail -= 1
+            queue[tail] = i
+            tail += 1
+        else:
+            nan_count += 1
+
+        if i >= window:
+            if values[i - window] != values[i - window]:
+                nan_count -= 1
+        while tail > head and queue[head] <= i - window:
+            head += 1
+
+        if i >= window - 1 and nan_count == 0 and tail > head:
+            out[i] = values[queue[head]]
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ring_next(pos, capacity):
+    """环形缓冲区下一个位置（用比较代替取模）"""
+    pos += 1
+    return 0 if pos == capacity else pos
+
+
+@njit(cache=True, nogil=True)
+def _ring_slot(head, offset, capacity):
+    """环形缓冲区中距队头 offset 的位置，offset < capacity"""
+    pos = head + offset
+    return pos - capacity if pos >= capacity else pos
+
+
+@njit(cache=True, nogil=True)
+def rolling_min_max(low, high, window):
+    """
+    一次遍历同时求 low 的滑动最小值与 high 的滑动最大值
+
+    两个单调队列都是容量为 window 的环形缓冲区（先淘汰过期下标再入队，
+    队内最多 window 个元素）。窗口内 low 或 high 任一含 NaN 时两者都输出 NaN，
+    %K 在这种情况下本来就是 NaN，因此结果与分别调用 rolling_extreme 一致。
+    """
+    n = low.shape[0]
+    low_min = np.full(n, np.nan)
+    high_max = np.full(n, np.nan)
+    if window <= 0:
+        return low_min, high_max
+    min_q = np.empty(window, dtype=np.int64)
+    max_q = np.empty(window, dtype=np.int64)
+    min_head = 0
+    min_len = 0
+    max_head = 0
+    max_len = 0
+    nan_count = 0
+
+    for i in range(n):
+        if i >= window:
+            j = i - window
+            if low[j] != low[j] or high[j] != high[j]:
+                nan_count -= 1
+            if min_len > 0 and min_q[min_head] == j:
+                min_head = _ring_next(min_head, window)
+                min_len -= 1
+            if max_len > 0 and max_q[max_head] == j:
+                max_head = _ring_next(max_head, window)
+                max_len -= 1
+
+        lo = low[i]
+        hi = high[i]
+        if lo != lo or hi != hi:
+            nan_count += 1
+        if lo == lo:
+            while min_len > 0 and low[min_q[_ring_slot(min_head, min_len - 1, window)]] >= lo:
+                min_len -= 1
+            min_q[_ring_slot(min_head, min_len, window)] = i
+            min_len += 1
+        if hi == hi:
+            while max_len > 0 and high[max_q[_ring_slot(max_head, max_len - 1, window)]] <= hi:
+                max_len -= 1
+            max_q[_ring_slot(max_head, max_len, window)] = i
+            max_len += 1
+
+        if i >= window - 1 and nan_count == 0:
+            low_min[i] = low[min_q[min_head]]
+            high_max[i] = high[max_q[max_head]]
+
+    return low_min, high_max
+
+
+@njit(cache=True, nogil=True)
+def stochastic_k(high, low, close, k_period):
+    """随机指标 %K = 100 * (收盘 - 最低) / (最高 - 最低)，除零语义与 numpy 一致"""
+    n = close.shape[0]
+    low_min, high_max = rolling_min_max(low, high, k_period)
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        num = close[i] - low_min[i]
+        den = high_max[i] - low_min[i]
+        if den == 0.0:
+            if num > 0:
+                out[i] = np.inf
+            elif num < 0:
+                out[i] = -np.inf
+            else:
+                out[i] = np.nan
+        else:
+            out[i] = 100.0 * (num / den)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def sma_ema_multi(close, periods):
+    """
+    一次遍历同时计算多个周期的 SMA 与 EMA
+
+    返回 (n, 2k) 数组：前 k 列为各周期 SMA，后 k 列为各周期 EMA（alpha=2/(p+1)）。
+    逐列结果分别与 rolling_mean、ewm_adjust_false 一致，但 close[i] 只读取一次。
+    """
+    n = close.shape[0]
+    k = periods.shape[0]
+    out = np.full((n, 2 * k), np.nan)
+
+    totals = np.zeros(k)
+    compensations = np.zeros(k)
+    nan_counts = np.zeros(k, dtype=np.int64)
+    weighted = np.full(k, np.nan)
+    old_wts = np.ones(k)
+    alphas = np.empty(k)
+    for j in range(k):
+        alphas[j] = 2.0 / (periods[j] + 1.0)
+
+    for i in range(n):
+        x = close[i]
+        is_observation = x == x
+        is_finite = np.isfinite(x)
+        for j in range(k):
+            window = periods[j]
+
+            # SMA：Kahan 补偿的滑动和（±inf 与 NaN 一样计为缺失）
+            if is_finite:
+                y = x - compensations[j]
+                t = totals[j] + y
+                compensations[j] = (t - totals[j]) - y
+                totals[j] = t
+            else:
+                nan_counts[j] += 1
+            if i >= window:
+                old = close[i - window]
+                if np.isfinite(old):
+                    y = -old - compensations[j]
+                    t = totals[j] + y
+                    compensations[j] = (t - totals[j]) - y
+                    totals[j] = t
+                else:
+                    nan_counts[j] -= 1
+            if i >= window - 1 and nan_counts[j] == 0:
+                out[i, j] = totals[j] / window
+
+            # EMA：adjust=False 递推
+            w = weighted[j]
+            if w == w:
+                old_wts[j] *= 1.0 - alphas[j]
+                if is_observation:
+                    if w != x:
+                        w = (old_wts[j] * w + alphas[j] * x) / (old_wts[j] + alphas[j])
+                    old_wts[j] = 1.0
+            elif is_observation:
+                w = x
+            weighted[j] = w
+            out[i, k + j] = w
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def fill_nan_forward_backward(block):
+    """
+    对二维数组逐列原地填充 NaN：先前向填充，再用首个有效值回填开头的 NaN
+
+    结果与 pandas DataFrame.ffill().bfill() 一致；整列为 NaN 时保持不变。
+    """
+    n, k = block.shape
+    for j in range(k):
+        last = np.nan
+        for i in range(n):
+            x = block[i, j]
+            if x != x:
+                block[i, j] = last
+            else:
+                last = x
+        last = np.nan
+        for i in range(n - 1, -1, -1):
+            x = block[i, j]
+            if x != x:
+                block[i, j] = last
+            else:
+                last = x
+    return block
+
+
+@njit(cache=True, nogil=True)
+def all_indicators(high, low, close, ma_periods):
+    """
+    calculate_all_indicators 的全部指标，写入一个预分配的 (12 + 2k, n) 缓冲区，每行一个指标
+
+    行顺序：RSI, MACD, MACD_Signal, MACD_Histogram, 各周期 (SMA, EMA),
+    BB_Upper, BB_Middle, BB_Lower, BB_Width, BB_Position, Stoch_K, Stoch_D, ATR。
+    参数与 calculate_all_indicators 的默认值相同，各行结果与单独调用对应内核一致。
+    """
+    n = close.shape[0]
+    k = ma_periods.shape[0]
+    out = np.empty((12 + 2 * k, n), dtype=np.float64)
+
+    out[0] = rsi(close, 14)
+    macd_line, signal_line, histogram = macd(close, 12, 26, 9)
+    out[1] = macd_line
+    out[2] = signal_line
+    out[3] = histogram
+
+    averages = sma_ema_multi(close, ma_periods)
+    for j in range(k):
+        out[4 + 2 * j] = averages[:, j]
+        out[5 + 2 * j] = averages[:, k + j]
+
+    row = 4 + 2 * k
+    upper, middle, lower = bollinger(close, 20, 2.0)
+    band = upper - lower
+    out[row] = upper
+    out[row + 1] = middle
+    out[row + 2] = lower
+    # 数组除法遵循 numpy 语义（除零得到 inf/NaN，不抛异常）
+    out[row + 3] = band / middle
+    out[row + 4] = (close - lower) / band
+
+    k_line = stochastic_k(high, low, close, 14)
+    out[row + 5] = k_line
+    out[row + 6] = rolling_mean(k_line, 3)
+    out[row + 7] = atr(high, low, close, 14)
+    return out
@@ -1,7 +1,17 @@
 # tradingagents/agents/utils/agent_utils.py - 修复版本
 
+import importlib
+import importlib.util
+import logging
+
 from langchain_core.messages import HumanMessage, RemoveMessage
 
+# 新版 LangGraph 支持用单个哨兵 RemoveMessage 清空全部消息
+try:
+    from langgraph.graph.message import REMOVE_ALL_MESSAGES
+except ImportError:
+    REMOVE_ALL_MESSAGES = None
+
 # Import tools from separate utility files
 from tradingagents.agents.utils.core_forex_tools import (
     get_forex_data
@@ -15,21 +25,48 @@ from tradingagents.agents.utils.news_data_tools import (
     get_news
 )
 
+logger = logging.getLogger(__name__)
+
+# 可选工具组：模块存在时才导入，统一登记在这里
+OPTIONAL_TOOLS = {}
+
+
+def _load_optional_tools(module_name, tool_names):
+    """导入可选工具组，模块不存在或导入失败时返回空字典"""
+    if importlib.util.find_spec(module_name) is None:
+        return {}
+    
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        logger.warning(f"可选工具模块 {module_name} 导入失败: {e}")
+        return {}
+    
+    tools = {name: getattr(module, name) for name in tool_names if hasattr(module, name)}
+    OPTIONAL_TOOLS.update(tools)
+    return tools
+
+
 # 量化分析工具 - 只导入实际存在的函数
-from tradingagents.agents.utils.quant_data_tools import (
-    get_risk_metrics_data,
-    get_volatility_data,
-    simple_forex_data
+_quant_tools = _load_optional_tools(
+    "tradingagents.agents.utils.quant_data_tools",
+    ("get_risk_metrics_data", "get_volatility_data", "simple_forex_data")
 )
+# 只绑定实际加载成功的工具：模块缺失时这些名字不存在（导入方得到 ImportError），
+# 也不会出现在 __all__ 中，避免把 None 当作工具交给 bind_tools
+globals().update(_quant_tools)
 
-# ✅ 添加宏观经济工具导入
-try:
-    from tradingagents.agents.utils.macro_data_tools import (
-        get_fred_data,
-        get_ecb_data,
-        get_macro_dashboard
-    )
-except ImportError:
+# ✅ 宏观经济工具
+_macro_tools = _load_optional_tools(
+    "tradingagents.agents.utils.macro_data_tools",
+    ("get_fred_data", "get_ecb_data", "get_macro_dashboard")
+)
+
+if _macro_tools:
+    get_fred_data = _macro_tools["get_fred_data"]
+    get_ecb_data = _macro_tools["get_ecb_data"]
+    get_macro_dashboard = _macro_tools["get_macro_dashboard"]
+else:
     # 如果导入失败，创建占位符函数
     def get_fred_data(*args, **kwargs):
         return "FRED data tool not available"
@@ -44,14 +81,28 @@ except ImportError:
 def create_msg_delete():
     def delete_messages(state):
         """Clear messages and add placeholder for Anthropic compatibility"""
-        messages = state["messages"]
-        
-        # Remove all messages
-        removal_operations = [RemoveMessage(id=m.id) for m in messages]
+        if REMOVE_ALL_MESSAGES is not None:
+            # Remove all messages with a single sentinel
+            removal_operations = [RemoveMessage(id=REMOVE_ALL_MESSAGES)]
+        else:
+            removal_operations = [RemoveMessage(id=m.id) for m in state["messages"]]
         
         # Add a minimal placeholder message
         placeholder = HumanMessage(content="Continue")
         
         return {"messages": removal_operations + [placeholder]}
     
-    return delete_messages
\ No newline at end of file
+    return delete_messages
+
+
+__all__ = [
+    "OPTIONAL_TOOLS",
+    "create_msg_delete",
+    "get_forex_data",
+    "get_indicators",
+    "get_news",
+    *_quant_tools,
+    "get_fred_data",
+    "get_ecb_data",
+    "get_macro_dashboard",
+]
@@ -3,6 +3,7 @@
 """
 import os
 import glob
+import heapq
 import pickle
 import time
 import pandas as pd
@@ -11,6 +12,25 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def _iter_cache_files(cache_dir):
+    """
+    逐个产出缓存目录中的 (路径, stat结果)
+
+    只包含非隐藏的 .pkl 普通文件（与 glob("*.pkl") 一致，另外排除目录）；
+    遍历期间被删除或无法 stat 的文件直接跳过。
+    """
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".pkl") or entry.name.startswith("."):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield entry.path, stat
+
 def get_cache_info():
     """
     获取缓存统计信息
@@ -20,20 +40,25 @@ def get_cache_info():
     if not os.path.exists(cache_dir):
         return {"total_files": 0, "total_size_mb": 0, "oldest_cache": None, "newest_cache": None}
     
-    cache_files = glob.glob(os.path.join(cache_dir, "*.pkl"))
-    
+    # 单次遍历：每个文件只 stat 一次，同时累计大小和最早/最新修改时间
+    total_files = 0
     total_size = 0
-    creation_times = []
+    oldest_mtime = float("inf")
+    newest_mtime = 0.0
     
-    for file_path in cache_files:
-        total_size += os.path.getsize(file_path)
-        creation_times.append(os.path.getmtime(file_path))
+    for _, stat in _iter_cache_files(cache_dir):
+        total_files += 1
+        total_size += stat.st_size
+        if stat.st_mtime < oldest_mtime:
+            oldest_mtime = stat.st_mtime
+        if stat.st_mtime > newest_mtime:
+            newest_mtime = stat.st_mtime
     
     info = {
-        "total_files": len(cache_files),
+        "total_files": total_files,
         "total_size_mb": total_size / (1024 * 1024),
-        "oldest_cache": datetime.fromtimestamp(min(creation_times)).strftime('%Y-%m-%d %H:%M') if creation_times else None,
-        "newest_cache": datetime.fromtimestamp(max(creation_times)).strftime('%Y-%m-%d %H:%M') if creation_times else None,
+        "oldest_cache": datetime.fromtimestamp(oldest_mtime).strftime('%Y-%m-%d %H:%M') if total_files else None,
+        "newest_cache": datetime.fromtimestamp(newest_mtime).strftime('%Y-%m-%d %H:%M') if total_files else None,
         "cache_dir": cache_dir
     }
     
@@ -71,10 +96,12 @@ def preview_cache_contents(limit=10):
     if not os.path.exists(cache_dir):
         return []
     
-    cache_files = glob.glob(os.path.join(cache_dir, "*.pkl"))
+    # 只保留最新的 limit 个文件，按修改时间倒序
+    newest = heapq.nlargest(limit, _iter_cache_files(cache_dir), key=lambda item: item[1].st_mtime)
+    
     preview_data = []
     
-    for i, file_path in enumerate(cache_files[:limit]):
+    for file_path, stat in newest:
         try:
             with open(file_path, 'rb') as f:
                 data = pickle.load(f)
@@ -88,8 +115,8 @@ def preview_cache_contents(limit=10):
             
             preview_data.append({
                 "file": os.path.basename(file_path),
-                "size_kb": os.path.getsize(file_path) / 1024,
-                "modified": datetime.fromtimestamp(os.path.getmtime(file_path)).strftime('%Y-%m-%d %H:%M'),
+                "size_kb": stat.st_size / 1024,
+                "modified": datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M'),
                 "preview": preview
             })
         except Exception as e:
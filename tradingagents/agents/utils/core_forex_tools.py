@@ -1,6 +1,8 @@
 # /tradingagents/agents/utils/core_forex_tools.py
+import asyncio
 from langchain_core.tools import tool
 from typing import Annotated
+from tradingagents.dataflows.interface import route_to_vendor
 
 @tool
 def get_forex_data(
@@ -24,4 +26,14 @@ def get_forex_data(
     Returns:
         str: A formatted dataframe containing the forex OHLCV price data for the specified pair in the specified date range.
     """
-    return route_to_vendor("get_forex_data", symbol, start_date, end_date)
\ No newline at end of file
+    return route_to_vendor("get_forex_data", symbol, start_date, end_date)
+
+
+async def aget_forex_data(symbol: str, start_date: str, end_date: str) -> str:
+    """
+    get_forex_data 的异步版本
+
+    在工作线程中执行同步的 route_to_vendor，不阻塞事件循环，
+    便于编排层用 asyncio.gather 并发获取多个货币对。
+    """
+    return await asyncio.to_thread(route_to_vendor, "get_forex_data", symbol, start_date, end_date)
@@ -10,9 +10,42 @@ import logging
 from datetime import datetime, timedelta
 
 # 导入vendor层接口
+from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.agents.utils import SHARED_EXECUTOR
 
 logger = logging.getLogger(__name__)
 
+# 仪表板支持的货币及其指标
+USD_INDICATORS = ("FEDFUNDS", "CPIAUCSL", "UNRATE", "DGS10")
+EUR_INDICATORS = ("DFR", "HICP", "UNEMPLOYMENT", "GDP")
+
+# 映射指标键到ECB系列键
+ECB_SERIES_MAP = {
+    "DFR": "FM.B.U2.EUR.4F.KR.DFR.LEV",
+    "HICP": "ICP.M.U2.N.000000.4.ANR",
+    "UNEMPLOYMENT": "STS.M.I8.Y.UNEH.RTT000.4.000",
+    "GDP": "MNA.Q.Y.I8.W2.S1.S1.B.B1GQ._Z._Z._Z.EUR.LR.N",
+}
+
+def _run_parallel(tasks):
+    """
+    并行执行相互独立的vendor调用，结果按提交顺序返回
+
+    Args:
+        tasks: (method, kwargs) 列表
+
+    Returns:
+        list: 每项为 (report, error)，调用失败时 report 为 None
+    """
+    def _call(method, kwargs):
+        try:
+            return route_to_vendor(method, **kwargs), None
+        except Exception as e:
+            return None, e
+
+    futures = [SHARED_EXECUTOR.submit(_call, method, kwargs) for method, kwargs in tasks]
+    return [future.result() for future in futures]
+
 @tool
 def get_fred_data(
     series_id: Annotated[str, "FRED series ID (e.g., 'FEDFUNDS', 'CPIAUCSL')"],
@@ -91,53 +124,33 @@ def get_macro_dashboard(
             base_currency = currency_pair[:3]
             quote_currency = currency_pair[3:]
         
-        # 根据货币对确定相关指标
-        usd_indicators = []
-        eur_indicators = []
+        # 既不涉及USD也不涉及EUR的货币对没有可用指标，直接返回
+        currencies = {base_currency, quote_currency}
+        if not currencies & {"USD", "EUR"}:
+            return f"No macroeconomic indicators configured for {currency_pair}"
         
-        if base_currency == "USD" or quote_currency == "USD":
-            usd_indicators = ["FEDFUNDS", "CPIAUCSL", "UNRATE", "DGS10"]
+        # 根据货币对确定相关指标
+        usd_indicators = USD_INDICATORS if "USD" in currencies else ()
+        eur_indicators = EUR_INDICATORS if "EUR" in currencies else ()
         
-        if base_currency == "EUR" or quote_currency == "EUR":
-            eur_indicators = ["DFR", "HICP", "UNEMPLOYMENT", "GDP"]
+        # 各指标请求相互独立，并行获取美国和欧元区数据
+        labels = []
+        tasks = []
+        for indicator in usd_indicators:
+            labels.append(("FRED", indicator))
+            tasks.append(("get_fred_data", {"series_id": indicator, "limit": 50}))
+        for indicator_key in eur_indicators:
+            labels.append(("ECB", indicator_key))
+            tasks.append(("get_ecb_data", {"series_key": ECB_SERIES_MAP.get(indicator_key, indicator_key)}))
         
         # 收集数据
         reports = []
-        
-        # 获取美国数据
-        for indicator in usd_indicators:
-            try:
-                report = route_to_vendor(
-                    "get_fred_data",
-                    series_id=indicator,
-                    limit=50
-                )
+        for (source, indicator), (report, error) in zip(labels, _run_parallel(tasks)):
+            if error is not None:
+                logger.warning(f"Failed to get {source} indicator {indicator}: {error}")
+                reports.append(f"\n## {indicator}\nError: {str(error)}")
+            else:
                 reports.append(f"\n## {indicator}\n{report}")
-            except Exception as e:
-                logger.warning(f"Failed to get FRED indicator {indicator}: {e}")
-                reports.append(f"\n## {indicator}\nError: {str(e)}")
-        
-        # 获取欧元区数据
-        for indicator_key in eur_indicators:
-            try:
-                # 映射指标键到ECB系列键
-                ecb_series_map = {
-                    "DFR": "FM.B.U2.EUR.4F.KR.DFR.LEV",
-                    "HICP": "ICP.M.U2.N.000000.4.ANR",
-                    "UNEMPLOYMENT": "STS.M.I8.Y.UNEH.RTT000.4.000",
-                    "GDP": "MNA.Q.Y.I8.W2.S1.S1.B.B1GQ._Z._Z._Z.EUR.LR.N",
-                }
-                
-                series_key = ecb_series_map.get(indicator_key, indicator_key)
-                
-                report = route_to_vendor(
-                    "get_ecb_data",
-                    series_key=series_key
-                )
-                reports.append(f"\n## {indicator_key}\n{report}")
-            except Exception as e:
-                logger.warning(f"Failed to get ECB indicator {indicator_key}: {e}")
-                reports.append(f"\n## {indicator_key}\nError: {str(e)}")
         
         # 生成仪表板
         if not reports:
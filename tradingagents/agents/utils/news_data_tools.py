@@ -1,9 +1,290 @@
 # /Users/fr./Downloads/TradingAgents-main/tradingagents/agents/utils/news_data_tools.py
 
 from langchain_core.tools import tool
-from typing import Annotated, Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Annotated, Optional, Dict, Any, List
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.dataflows.config import get_config
+
+try:
+    # orjson 解析大体积vendor响应更快；其 JSONDecodeError 是 json.JSONDecodeError 的子类
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# 新闻响应缓存（进程内TTL缓存），NEWS_CACHE_TTL=0 可关闭
+NEWS_CACHE_TTL = float(os.environ.get('NEWS_CACHE_TTL', '300'))
+NEWS_CACHE_MAXSIZE = 256
+
+_news_cache: Dict[str, tuple] = {}
+_news_cache_lock = threading.Lock()
+
+
+def _news_cache_key(params: Dict[str, Any]) -> str:
+    """由优化后的请求参数生成缓存键"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _news_cache_get(key: str):
+    """读取未过期的缓存结果，未命中返回 None"""
+    if NEWS_CACHE_TTL <= 0:
+        return None
+    with _news_cache_lock:
+        entry = _news_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _news_cache[key]
+            return None
+        return value
+
+
+def _news_cache_set(key: str, value: Any) -> None:
+    """写入缓存，超出容量时淘汰最早写入的条目"""
+    if NEWS_CACHE_TTL <= 0:
+        return
+    with _news_cache_lock:
+        if key not in _news_cache and len(_news_cache) >= NEWS_CACHE_MAXSIZE:
+            del _news_cache[next(iter(_news_cache))]
+        _news_cache[key] = (time.monotonic() + NEWS_CACHE_TTL, value)
+
+
+# vendor调用超时（秒），可通过配置 news_data.timeout_seconds 覆盖
+NEWS_VENDOR_TIMEOUT = 8.0
+# 超时后熔断的时长（秒），期间同一 (vendor, 货币对) 的调用直接失败，不再请求vendor
+NEWS_CIRCUIT_OPEN_SECS = 30.0
+# 同时在途的新闻vendor请求上限；超时的请求仍占用线程直到自行结束
+NEWS_VENDOR_MAX_INFLIGHT = 4
+
+# 新闻vendor调用使用独立的小线程池，超时挂起的请求不会占满 SHARED_EXECUTOR 影响其他工具
+_news_vendor_executor = ThreadPoolExecutor(
+    max_workers=NEWS_VENDOR_MAX_INFLIGHT,
+    thread_name_prefix="news-vendor"
+)
+atexit.register(_news_vendor_executor.shutdown, wait=False)
+_news_vendor_slots = threading.BoundedSemaphore(NEWS_VENDOR_MAX_INFLIGHT)
+
+# (vendor, 货币对) -> 熔断结束时间（monotonic）
+_circuit_open_until: Dict[tuple, float] = {}
+_circuit_lock = threading.Lock()
+
+
+class NewsVendorTimeout(Exception):
+    """新闻vendor调用超时、处于熔断期或在途请求已满"""
+
+
+def _news_vendor_timeout() -> float:
+    """读取新闻vendor调用超时配置"""
+    news_config = get_config().get('news_data')
+    if isinstance(news_config, dict):
+        return float(news_config.get('timeout_seconds', NEWS_VENDOR_TIMEOUT))
+    return NEWS_VENDOR_TIMEOUT
+
+
+def _call_vendor_with_timeout(params: Dict[str, Any]) -> Any:
+    """
+    在新闻专用线程池中调用vendor并限制等待时间
+
+    超时后只对该 (vendor, 货币对) 打开熔断器，熔断期内的相同调用直接失败，
+    其他货币对或vendor不受影响。在途请求达到上限时，在超时预算内等待空闲名额。
+    注意：超时只是停止等待，后台线程中的请求仍会自行结束并释放名额。
+    """
+    circuit_key = (_resolve_primary_vendor(), params.get('ticker') or "")
+    with _circuit_lock:
+        open_until = _circuit_open_until.get(circuit_key)
+        if open_until is not None:
+            if time.monotonic() < open_until:
+                raise NewsVendorTimeout("circuit_open")
+            del _circuit_open_until[circuit_key]
+    
+    # 等待空闲名额与等待结果共用同一个超时预算
+    timeout = _news_vendor_timeout()
+    deadline = time.monotonic() + timeout
+    if not _news_vendor_slots.acquire(timeout=timeout):
+        raise NewsVendorTimeout("vendor_busy")
+    try:
+        future = _news_vendor_executor.submit(route_to_vendor, "get_news", **params)
+    except BaseException:
+        _news_vendor_slots.release()
+        raise
+    future.add_done_callback(lambda _: _news_vendor_slots.release())
+    
+    try:
+        return future.result(timeout=max(deadline - time.monotonic(), 0.0))
+    except FutureTimeoutError:
+        with _circuit_lock:
+            _circuit_open_until[circuit_key] = time.monotonic() + NEWS_CIRCUIT_OPEN_SECS
+        raise NewsVendorTimeout("vendor_timeout")
+
+
+# 正在进行中的请求，相同参数的并发调用共享同一次上游请求
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _fetch_news_single_flight(key: str, params: Dict[str, Any]) -> Any:
+    """
+    合并并发的相同新闻请求
+
+    第一个调用者负责请求vendor并写入缓存，其余调用者等待同一个结果。
+    返回 (vendor结果, 获取时间) 元组。
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _inflight[key] = future
+    
+    if not owner:
+        return future.result()
+    
+    try:
+        result = _call_vendor_with_timeout(params)
+        entry = (result, datetime.now().isoformat(timespec="seconds"))
+        _news_cache_set(key, entry)
+        future.set_result(entry)
+        return entry
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _fetch_news(params: Dict[str, Any]) -> tuple:
+    """
+    获取新闻的统一入口，get_news 与 get_news_direct 共用
+
+    先查TTL缓存，未命中时经并发合并请求vendor。返回 (vendor结果, 获取时间)，
+    超时或熔断时抛出 NewsVendorTimeout。
+    """
+    key = _news_cache_key(params)
+    entry = _news_cache_get(key)
+    if entry is None:
+        entry = _fetch_news_single_flight(key, params)
+    return entry
+
+
+def prime_news_cache(tickers: List[str]) -> int:
+    """
+    预热新闻缓存
+
+    在智能体启动时为预期的货币对并发获取默认参数下的新闻，
+    之后 get_news / get_news_direct 的相同请求直接命中缓存。
+    返回成功预热的数量。
+    """
+    if not tickers:
+        return 0
+    
+    primary_vendor = _resolve_primary_vendor()
+    primed = 0
+    # 使用独立线程池：_fetch_news 内部会在新闻vendor线程池上等待vendor调用，
+    # 若提交到同一个线程池，货币对较多时可能占满线程导致互相等待
+    with ThreadPoolExecutor(max_workers=min(8, len(tickers)), thread_name_prefix="news-prime") as pool:
+        futures = {
+            ticker: pool.submit(
+                _fetch_news, optimize_parameters_for_vendor(primary_vendor=primary_vendor, ticker=ticker)
+            )
+            for ticker in tickers
+        }
+        for ticker, future in futures.items():
+            try:
+                future.result()
+                primed += 1
+            except Exception as e:
+                logger.warning(f"预热 {ticker} 新闻缓存失败: {e}")
+    return primed
+
+
+def clear_news_cache() -> None:
+    """清空新闻响应缓存"""
+    with _news_cache_lock:
+        _news_cache.clear()
+
+
+# 默认日期范围所需的日期字符串，每60秒刷新一次
+_DATE_CACHE_TTL = 60.0
+_date_cache: Optional[tuple] = None  # (monotonic时间戳, {"today", "d1", "d7"})
+
+
+def _todays_dates() -> Dict[str, str]:
+    """返回今天、1天前、7天前的 yyyy-mm-dd 字符串（带短时缓存）"""
+    global _date_cache
+    now = time.monotonic()
+    cached = _date_cache
+    if cached is None or now - cached[0] > _DATE_CACHE_TTL:
+        today = date.today()
+        cached = (now, {
+            "today": today.isoformat(),
+            "d1": (today - timedelta(days=1)).isoformat(),
+            "d7": (today - timedelta(days=7)).isoformat()
+        })
+        # 整体替换元组，并发读取者不会看到半更新的状态
+        _date_cache = cached
+    return cached[1]
+
+
+# 稳定内容与易变内容的分隔行，上游可据此放置提示缓存断点
+NEWS_VOLATILE_SENTINEL = "--- VOLATILE ---"
+
+
+def _format_news_output(
+    params: Dict[str, Any],
+    result: Any,
+    fetched_at: str,
+    vendor: str,
+    stable_only: bool = False
+) -> str:
+    """
+    按“稳定内容在前、易变内容在后”的顺序组织新闻输出
+
+    相同请求的前缀保持逐字节一致，便于LLM供应商的提示缓存命中；
+    获取时间等易变信息放在分隔行之后。
+    """
+    header = "[NEWS] ticker={} | topics={} | range={}..{}".format(
+        params.get('ticker') or "ALL",
+        params.get('topics') or "-",
+        params.get('start_date') or "-",
+        params.get('end_date') or "-"
+    )
+    
+    if isinstance(result, str):
+        body = result.strip()
+    else:
+        body = json.dumps(result, sort_keys=True, ensure_ascii=False, default=str)
+    
+    if stable_only:
+        return f"{header}\n{body}"
+    return f"{header}\n{body}\n{NEWS_VOLATILE_SENTINEL}\nfetched_at={fetched_at} | vendor={vendor}"
+
+
+@lru_cache(maxsize=8)
+def _parse_primary_vendor(vendor_config: str) -> str:
+    """从逗号分隔的vendor配置中取出主要供应商"""
+    return vendor_config.split(',')[0].strip()
+
+
+def _resolve_primary_vendor() -> str:
+    """根据当前配置确定新闻数据的主要供应商，默认 alpha_vantage"""
+    vendor_config = (get_config().get('news_data') or {}).get('vendor')
+    if isinstance(vendor_config, str):
+        return _parse_primary_vendor(vendor_config)
+    return "alpha_vantage"
+
 
 
 @tool
@@ -13,7 +294,8 @@ def get_news(
     end_date: Annotated[Optional[str], "End date in yyyy-mm-dd format (optional)"] = None,
     topics: Annotated[Optional[str], "News topics (e.g., 'forex,economy_macro,central_banks')"] = None,
     limit: Annotated[Optional[int], "Maximum number of news items"] = None,
-    vendor_aware: Annotated[Optional[bool], "Whether to adjust parameters based on vendor"] = True
+    vendor_aware: Annotated[Optional[bool], "Whether to adjust parameters based on vendor"] = True,
+    stable_only: Annotated[Optional[bool], "Omit the volatile trailer (fetch time, vendor) after the sentinel line"] = False
 ) -> str:
     """
     Retrieve forex market news and sentiment data with vendor-aware optimization.
@@ -29,21 +311,13 @@ def get_news(
         topics: Optional topics filter
         limit: Maximum number of news items
         vendor_aware: Whether to optimize parameters based on vendor
+        stable_only: Return only the stable header and news body
     
     Returns:
-        str: Formatted string containing forex news with sentiment analysis
+        str: Stable header and news body, followed by a sentinel line and
+            a volatile trailer (omitted when stable_only is set)
     """
-    
-    # 获取当前配置以确定主要供应商
-    from tradingagents.dataflows.config import get_config
-    config = get_config()
-    
-    # 确定主要供应商
-    primary_vendor = "alpha_vantage"  # 默认
-    if config.get('news_data') and 'vendor' in config['news_data']:
-        vendor_config = config['news_data']['vendor']
-        if isinstance(vendor_config, str):
-            primary_vendor = vendor_config.split(',')[0].strip()
+    primary_vendor = _resolve_primary_vendor()
     
     # 根据供应商优化参数
     optimized_params = optimize_parameters_for_vendor(
@@ -56,8 +330,96 @@ def get_news(
         vendor_aware=vendor_aware
     )
     
-    # 调用 route_to_vendor
-    return route_to_vendor("get_news", **optimized_params)
+    # 相同参数在TTL内直接返回缓存结果，并发的相同请求只发出一次
+    try:
+        result, fetched_at = _fetch_news(optimized_params)
+    except NewsVendorTimeout as e:
+        return json.dumps({"success": False, "error": str(e)})
+    
+    return _format_news_output(optimized_params, result, fetched_at, primary_vendor, bool(stable_only))
+
+async def aget_news(
+    ticker: Optional[str] = "",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    topics: Optional[str] = None,
+    limit: Optional[int] = None,
+    vendor_aware: bool = True,
+    stable_only: bool = False
+) -> str:
+    """
+    get_news 的异步版本
+
+    在工作线程中执行同步的新闻获取（共享缓存与并发合并），不阻塞事件循环，
+    便于编排层用 asyncio.gather 并发获取多个货币对的新闻。
+    """
+    return await asyncio.to_thread(
+        get_news.func, ticker, start_date, end_date, topics, limit, vendor_aware, stable_only
+    )
+
+
+def _opt_openai(start_date, end_date, limit) -> Dict[str, Any]:
+    """OpenAI: 限制为最近1-2天，少量数据，避免超时"""
+    params = {}
+    if not start_date and not end_date:
+        # 如果没有指定日期，默认最近1天
+        dates = _todays_dates()
+        params['start_date'] = dates["d1"]
+        params['end_date'] = dates["today"]
+    elif start_date and end_date:
+        # 如果指定了日期，确保不超过2天
+        # fromisoformat 为C实现，比 strptime 解析格式串快得多
+        try:
+            start_dt = date.fromisoformat(start_date)
+            end_dt = date.fromisoformat(end_date)
+        except ValueError:
+            pass
+        else:
+            if (end_dt - start_dt).days > 2:
+                # 如果超过2天，调整为最近2天
+                params['end_date'] = end_date
+                params['start_date'] = (end_dt - timedelta(days=2)).isoformat()
+    
+    # OpenAI: 限制数量为5-10条
+    if limit is None or limit > 10:
+        params['limit'] = 10
+    elif limit < 3:
+        params['limit'] = 3
+    return params
+
+
+def _opt_alphavantage(start_date, end_date, limit) -> Dict[str, Any]:
+    """AlphaVantage 或其他: 可以处理较长时间范围，返回更多数据"""
+    params = {}
+    if not start_date and not end_date:
+        # 默认最近7天
+        dates = _todays_dates()
+        params['start_date'] = dates["d7"]
+        params['end_date'] = dates["today"]
+    
+    if limit is None or limit > 50:
+        params['limit'] = 50
+    return params
+
+
+def _opt_passthrough(start_date, end_date, limit) -> Dict[str, Any]:
+    """不进行供应商优化，原样传递参数"""
+    params = {}
+    if start_date:
+        params['start_date'] = start_date
+    if end_date:
+        params['end_date'] = end_date
+    if limit is not None:
+        params['limit'] = limit
+    return params
+
+
+# 供应商 -> 参数优化函数，未列出的供应商按 AlphaVantage 处理
+_VENDOR_OPTIMIZERS = {
+    "openai": _opt_openai,
+    "alpha_vantage": _opt_alphavantage,
+}
+
 
 def optimize_parameters_for_vendor(
     primary_vendor: str,
@@ -74,67 +436,16 @@ def optimize_parameters_for_vendor(
     AlphaVantage: 可以处理较长时间范围，返回结构化数据快
     OpenAI: 需要限制数据量，避免超时
     """
+    if vendor_aware:
+        optimizer = _VENDOR_OPTIMIZERS.get(primary_vendor, _opt_alphavantage)
+    else:
+        optimizer = _opt_passthrough
     
-    params = {}
-    
-    # 基本参数
+    params = optimizer(start_date, end_date, limit)
     if ticker is not None:
         params['ticker'] = ticker
-    
-    # 根据供应商调整时间范围和限制
-    if vendor_aware:
-        if primary_vendor == 'openai':
-            # OpenAI: 限制为最近1-2天，少量数据
-            if not start_date and not end_date:
-                # 如果没有指定日期，默认最近1天
-                end_date_obj = datetime.now()
-                start_date_obj = end_date_obj - timedelta(days=1)
-                params['start_date'] = start_date_obj.strftime("%Y-%m-%d")
-                params['end_date'] = end_date_obj.strftime("%Y-%m-%d")
-            elif start_date and end_date:
-                # 如果指定了日期，确保不超过2天
-                try:
-                    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-                    days_diff = (end_dt - start_dt).days
-                    if days_diff > 2:
-                        # 如果超过2天，调整为最近2天
-                        params['end_date'] = end_date
-                        params['start_date'] = (end_dt - timedelta(days=2)).strftime("%Y-%m-%d")
-                except:
-                    pass
-            
-            # OpenAI: 限制数量为5-10条
-            if limit is None or limit > 10:
-                params['limit'] = 10
-            elif limit < 3:
-                params['limit'] = 3
-        
-        else:  # AlphaVantage 或其他
-            # AlphaVantage: 可以处理更长时间范围
-            if not start_date and not end_date:
-                # 默认最近7天
-                end_date_obj = datetime.now()
-                start_date_obj = end_date_obj - timedelta(days=7)
-                params['start_date'] = start_date_obj.strftime("%Y-%m-%d")
-                params['end_date'] = end_date_obj.strftime("%Y-%m-%d")
-            
-            # AlphaVantage: 可以返回更多数据
-            if limit is None or limit > 50:
-                params['limit'] = 50
-    
-    else:  # 不进行供应商优化
-        if start_date:
-            params['start_date'] = start_date
-        if end_date:
-            params['end_date'] = end_date
-        if limit is not None:
-            params['limit'] = limit
-    
-    # 其他参数
     if topics is not None:
         params['topics'] = topics
-    
     return params
 
 
@@ -151,20 +462,9 @@ def get_news_direct(
     
     用于需要预加载数据的场景
     """
-    from tradingagents.dataflows.config import get_config
-    
-    config = get_config()
-    
-    # 确定主要供应商
-    primary_vendor = "alpha_vantage"
-    if config.get('news_data') and 'vendor' in config['news_data']:
-        vendor_config = config['news_data']['vendor']
-        if isinstance(vendor_config, str):
-            primary_vendor = vendor_config.split(',')[0].strip()
-    
     # 根据供应商优化参数
     optimized_params = optimize_parameters_for_vendor(
-        primary_vendor=primary_vendor,
+        primary_vendor=_resolve_primary_vendor(),
         ticker=ticker,
         start_date=start_date,
         end_date=end_date,
@@ -173,23 +473,25 @@ def get_news_direct(
         vendor_aware=vendor_aware
     )
     
-    # 直接调用底层函数
+    # 与 get_news 共用缓存
     try:
-        result = route_to_vendor("get_news", **optimized_params)
+        result, _ = _fetch_news(optimized_params)
         
-        # 返回结构化数据
+        # 返回结构化数据（复制一层，避免调用方修改缓存中的对象）
         if isinstance(result, dict):
-            return result
+            return dict(result)
         elif isinstance(result, str):
-            # 尝试解析字符串
-            try:
-                import json
-                return json.loads(result)
-            except:
-                # 如果解析失败，返回简单结构
-                return {"raw_data": result}
+            # 只有看起来像JSON时才尝试解析，普通文本直接返回简单结构
+            if result.lstrip().startswith(("{", "[")):
+                try:
+                    return _loads(result)
+                except json.JSONDecodeError:
+                    pass
+            return {"raw_data": result}
         else:
             return {"data": result}
             
+    except NewsVendorTimeout as e:
+        return {"success": False, "error": str(e)}
     except Exception as e:
         return {"error": str(e)}
\ No newline at end of file
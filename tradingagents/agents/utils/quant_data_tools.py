@@ -5,6 +5,19 @@ from langchain_core.tools import tool
 from typing import Annotated
 import json
 
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        """序列化为JSON字符串（orjson，原生支持numpy类型，不转义非ASCII字符）"""
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        """序列化为JSON字符串（标准库回退）"""
+        return json.dumps(obj, ensure_ascii=False)
+
 # 1. 风险指标工具
 @tool
 def get_risk_metrics_data(
@@ -23,7 +36,7 @@ def get_risk_metrics_data(
     返回:
         JSON格式的风险指标数据
     """
-    return json.dumps({
+    return _dumps({
         "success": True,
         "symbol": symbol,
         "function": "get_risk_metrics_data",
@@ -34,7 +47,7 @@ def get_risk_metrics_data(
             "max_drawdown": -0.08,
             "var_95": -0.02
         }
-    }, ensure_ascii=False)
+    })
 
 # 2. 波动率工具
 @tool
@@ -54,7 +67,7 @@ def get_volatility_data(
     返回:
         JSON格式的波动率指标数据
     """
-    return json.dumps({
+    return _dumps({
         "success": True,
         "symbol": symbol,
         "function": "get_volatility_data",
@@ -65,7 +78,7 @@ def get_volatility_data(
             "current_vol_20d": 0.012,
             "atr_14": 0.008
         }
-    }, ensure_ascii=False)
+    })
 
 # 3. 简化数据工具
 @tool
@@ -91,33 +104,33 @@ def simple_forex_data(
     """
     if what == "risk":
         # 直接调用风险指标函数
-        return json.dumps({
+        return _dumps({
             "success": True,
             "symbol": symbol,
             "type": "risk",
             "function": "simple_forex_data",
             "via": "get_risk_metrics_data",
             "status": "placeholder"
-        }, ensure_ascii=False)
+        })
     elif what == "volatility":
         # 直接调用波动率函数
-        return json.dumps({
+        return _dumps({
             "success": True,
             "symbol": symbol,
             "type": "volatility",
             "function": "simple_forex_data",
             "via": "get_volatility_data",
             "status": "placeholder"
-        }, ensure_ascii=False)
+        })
     else:
-        return json.dumps({
+        return _dumps({
             "success": True,
             "symbol": symbol,
             "type": what,
             "function": "simple_forex_data",
             "status": "placeholder - 最小化版本",
             "message": f"请求数据类型: {what}"
-        }, ensure_ascii=False)
+        })
 
 # 导出列表
 __all__ = [
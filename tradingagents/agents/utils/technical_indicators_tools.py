@@ -4,14 +4,40 @@
 """
 
 from langchain_core.tools import tool
-from typing import Annotated, List, Dict, Any, Optional
+from typing import Annotated, List, Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import logging
 import json
+import copy
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 import sys
 import os
+import time
+
+from tradingagents.agents.utils import _kernels
+from tradingagents.agents.utils._kernels import NUMBA_AVAILABLE
+
+try:
+    from scipy.signal import lfilter as _lfilter
+except ImportError:
+    _lfilter = None
+
+try:
+    import talib as _talib
+except ImportError:
+    _talib = None
+
+# 路由函数在模块加载时导入一次；导入失败时为 None，由 get_router_function 按候选路径查找
+try:
+    from tradingagents.dataflows.interface import route_to_vendor
+except ImportError:
+    route_to_vendor = None
 
 # ==================== 配置和初始化 ====================
 logger = logging.getLogger(__name__)
@@ -19,50 +45,213 @@ logger = logging.getLogger(__name__)
 # 模拟数据模式（当真实数据源不可用时启用）
 SIMULATION_MODE = os.environ.get('TECHNICAL_SIMULATION_MODE', 'false').lower() == 'true'
 
+# 移动平均线周期
+MA_PERIODS = (5, 10, 20, 50, 200)
+MA_PERIODS_ARRAY = np.array(MA_PERIODS, dtype=np.int64)
+
+# 斐波那契回撤比例
+FIB_RATIO_KEYS = ('0.0', '0.236', '0.382', '0.5', '0.618', '0.786', '1.0')
+FIB_RATIOS = np.array([0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0])
+
 # ==================== 核心技术指标计算函数 ====================
 
+def _ewm_arr(values: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    指数加权移动平均（adjust=False）
+
+    依次尝试：numba 编译内核 → scipy lfilter（IIR滤波，仅限首个有效值之后无 NaN 的序列）→ pandas ewm。
+    """
+    if NUMBA_AVAILABLE:
+        return _kernels.ewm_adjust_false(values, alpha, min_periods)
+    
+    if _lfilter is not None:
+        valid = ~np.isnan(values)
+        if valid.any():
+            first = int(valid.argmax())
+            tail = values[first:]
+            if valid[first:].all():
+                # y[i] = alpha*x[i] + (1-alpha)*y[i-1]，初始状态使 y[first] = x[first]
+                out = np.full(len(values), np.nan)
+                out[first:] = _lfilter([alpha], [1.0, alpha - 1.0], tail, zi=[(1.0 - alpha) * tail[0]])[0]
+                out[first:first + max(min_periods, 1) - 1] = np.nan
+                return out
+    
+    return pd.Series(values).ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean().to_numpy()
+
+def _talib_ready(*arrays: np.ndarray) -> bool:
+    """TA-Lib 可用且输入全为有限值（TA-Lib 对 NaN/inf 的传播方式与 pandas 不同）"""
+    return _talib is not None and all(np.isfinite(a).all() for a in arrays)
+
+# sliding_window_view 归约为 O(n·w)、前缀和做差的误差随长度累积，
+# 两者仅在短序列上使用（实测约1000行以内快于 pandas rolling）
+SLIDING_WINDOW_MAX_ROWS = 1024
+
+def _rolling_mean_arr(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    简单移动平均：numba O(n) 增量内核 → TA-Lib SMA → 前缀和（短序列）→ pandas
+
+    前缀和做差的舍入误差随累加长度增长，因此与 sliding_window_view 一样只用于
+    SLIDING_WINDOW_MAX_ROWS 以内的序列。窗口内含 NaN/inf 时为 NaN，与 pandas 一致。
+    """
+    if NUMBA_AVAILABLE:
+        return _kernels.rolling_mean(values, window)
+    if _talib_ready(values):
+        return _talib.SMA(values, timeperiod=window)
+    if len(values) > SLIDING_WINDOW_MAX_ROWS:
+        return pd.Series(values).rolling(window=window).mean().to_numpy()
+    
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        finite = np.isfinite(values)
+        sums = np.concatenate(([0.0], np.cumsum(np.where(finite, values, 0.0))))
+        missing = np.concatenate(([0], np.cumsum(~finite)))
+        window_sums = sums[window:] - sums[:-window]
+        window_sums[(missing[window:] - missing[:-window]) > 0] = np.nan
+        out[window - 1:] = window_sums / window
+        # 与 pandas 一致：窗口内数值全部相同时直接取该值，避免前缀和做差的舍入误差
+        positions = np.arange(len(values))
+        run_start = np.maximum.accumulate(
+            np.where(np.concatenate(([True], values[1:] != values[:-1])), positions, 0))
+        constant = finite & (positions - run_start + 1 >= window)
+        out[constant] = values[constant]
+    return out
+
+def _wilder_arr(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder 平滑（RMA）：首个完整窗口的简单均值作种子，之后按 alpha=1/period 递推
+
+    与 TA-Lib RSI/ATR 口径一致，种子之前为 NaN。numba 内核 → SMA 种子 + _ewm_arr。
+    """
+    if NUMBA_AVAILABLE:
+        return _kernels.wilder_rma(values, period)
+    seed = _rolling_mean_arr(values, period)
+    seeded = np.full(len(values), np.nan)
+    valid = ~np.isnan(seed)
+    if not valid.any():
+        return seeded
+    start = int(valid.argmax())
+    seeded[start] = seed[start]
+    seeded[start + 1:] = values[start + 1:]
+    return _ewm_arr(seeded, 1 / period)
+
+def _rolling_reduce(values: np.ndarray, window: int, reducer: str, **kwargs) -> np.ndarray:
+    """
+    滑动窗口归约（std/min/max），前 window-1 个位置为 NaN
+
+    短序列使用 sliding_window_view 一次性归约，避免 pandas rolling 的调用开销；
+    长序列交给 pandas 的 O(n) 滚动实现。窗口内含 NaN 时结果为 NaN，与 pandas rolling(window) 一致。
+    """
+    if len(values) > SLIDING_WINDOW_MAX_ROWS:
+        return getattr(pd.Series(values).rolling(window=window), reducer)(**kwargs).to_numpy()
+    
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        windows = sliding_window_view(values, window)
+        out[window - 1:] = getattr(windows, reducer)(axis=1, **kwargs)
+        if reducer == 'std':
+            # 与 pandas 一致：窗口内数值全部相同时标准差为 0，而不是均值舍入误差带来的 ~1e-16
+            out[window - 1:][np.ptp(windows, axis=1) == 0] = 0.0
+    return out
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """取出 float64 连续数组"""
+    return np.ascontiguousarray(df[name].to_numpy(dtype=np.float64))
+
+# ---------- 数组版本（ndarray -> ndarray，供 calculate_all_indicators 复用同一组输入数组） ----------
+
+def _rsi_arr(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI（Wilder平滑）"""
+    if NUMBA_AVAILABLE:
+        return _kernels.rsi(close, period)
+    delta = np.empty_like(close)
+    delta[0] = np.nan
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[np.isnan(delta)] = np.nan
+    loss[np.isnan(delta)] = np.nan
+    avg_gain = _wilder_arr(gain, period)
+    avg_loss = _wilder_arr(loss, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+def _macd_arr(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+    """MACD线、信号线、柱状图"""
+    if NUMBA_AVAILABLE:
+        return _kernels.macd(close, fast, slow, signal)
+    macd_line = _ewm_arr(close, 2 / (fast + 1)) - _ewm_arr(close, 2 / (slow + 1))
+    signal_line = _ewm_arr(macd_line, 2 / (signal + 1))
+    return macd_line, signal_line, macd_line - signal_line
+
+def _bb_arr(close: np.ndarray, period: int = 20, std: int = 2) -> tuple:
+    """布林带上轨、中轨、下轨（样本标准差）"""
+    if NUMBA_AVAILABLE:
+        return _kernels.bollinger(close, period, float(std))
+    sma = _rolling_mean_arr(close, period)
+    rolling_std = _rolling_reduce(close, period, 'std', ddof=1)
+    return sma + rolling_std * std, sma, sma - rolling_std * std
+
+def _stoch_arr(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               k_period: int = 14, d_period: int = 3) -> tuple:
+    """随机指标 %K、%D"""
+    if NUMBA_AVAILABLE:
+        k_line = _kernels.stochastic_k(high, low, close, k_period)
+    else:
+        if _talib_ready(high, low):
+            low_min = _talib.MIN(low, timeperiod=k_period)
+            high_max = _talib.MAX(high, timeperiod=k_period)
+        else:
+            low_min = _rolling_reduce(low, k_period, 'min')
+            high_max = _rolling_reduce(high, k_period, 'max')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k_line = 100 * ((close - low_min) / (high_max - low_min))
+    # %K 在区间为零时可能为 inf，滚动均值按 pandas 口径把窗口内的 inf 视为缺失
+    return k_line, _rolling_mean_arr(k_line, d_period)
+
+def _atr_arr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """平均真实波幅（Wilder平滑）"""
+    if NUMBA_AVAILABLE:
+        return _kernels.atr(high, low, close, period)
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    # 两个缓冲区原地计算 max(H-L, |H-Cprev|, |L-Cprev|)，不产生额外临时数组；
+    # 使用 np.maximum（而非 fmax）以保留首行 NaN
+    true_range = high - low
+    scratch = np.subtract(high, prev_close)
+    np.abs(scratch, out=scratch)
+    np.maximum(true_range, scratch, out=true_range)
+    np.subtract(low, prev_close, out=scratch)
+    np.abs(scratch, out=scratch)
+    np.maximum(true_range, scratch, out=true_range)
+    return _wilder_arr(true_range, period)
+
+# ---------- DataFrame 版本（公开接口，保持原有签名与返回类型） ----------
+
 def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
-    """计算RSI相对强弱指数"""
-    delta = df['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    """计算RSI相对强弱指数（Wilder平滑，与TradingView/TA-Lib口径一致）"""
+    return pd.Series(_rsi_arr(_column(df, 'close'), period), index=df.index)
 
 def calculate_macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
     """计算MACD指标"""
-    ema_fast = df['close'].ewm(span=fast, adjust=False).mean()
-    ema_slow = df['close'].ewm(span=slow, adjust=False).mean()
-    macd_line = ema_fast - ema_slow
-    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-    histogram = macd_line - signal_line
-    return macd_line, signal_line, histogram
+    return tuple(pd.Series(values, index=df.index)
+                 for values in _macd_arr(_column(df, 'close'), fast, slow, signal))
 
 def calculate_bollinger_bands(df: pd.DataFrame, period: int = 20, std: int = 2) -> tuple:
     """计算布林带"""
-    sma = df['close'].rolling(window=period).mean()
-    rolling_std = df['close'].rolling(window=period).std()
-    upper_band = sma + (rolling_std * std)
-    lower_band = sma - (rolling_std * std)
-    return upper_band, sma, lower_band
+    return tuple(pd.Series(values, index=df.index)
+                 for values in _bb_arr(_column(df, 'close'), period, std))
 
 def calculate_stochastic(df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> tuple:
     """计算随机指标"""
-    low_min = df['low'].rolling(window=k_period).min()
-    high_max = df['high'].rolling(window=k_period).max()
-    k_line = 100 * ((df['close'] - low_min) / (high_max - low_min))
-    d_line = k_line.rolling(window=d_period).mean()
-    return k_line, d_line
+    return tuple(pd.Series(values, index=df.index)
+                 for values in _stoch_arr(_column(df, 'high'), _column(df, 'low'), _column(df, 'close'),
+                                          k_period, d_period))
 
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
-    """计算平均真实波幅"""
-    high_low = df['high'] - df['low']
-    high_close = np.abs(df['high'] - df['close'].shift())
-    low_close = np.abs(df['low'] - df['close'].shift())
-    true_range = np.maximum(np.maximum(high_low, high_close), low_close)
-    atr = true_range.rolling(window=period).mean()
-    return atr
+    """计算平均真实波幅（Wilder平滑，与TA-Lib口径一致）"""
+    return pd.Series(_atr_arr(_column(df, 'high'), _column(df, 'low'), _column(df, 'close'), period),
+                     index=df.index)
 
 def calculate_fibonacci_levels(df: pd.DataFrame, lookback_period: int = 60) -> dict:
     """
@@ -72,64 +261,91 @@ def calculate_fibonacci_levels(df: pd.DataFrame, lookback_period: int = 60) -> d
     if len(df) < lookback_period:
         lookback_period = len(df)
     
-    recent_data = df.tail(lookback_period)
-    high = recent_data['high'].max()
-    low = recent_data['low'].min()
+    # 直接在列数组的视图上切片归约，不复制 DataFrame
+    start = len(df) - lookback_period
+    recent_high = df['high'].to_numpy(dtype=np.float64)[start:]
+    recent_low = df['low'].to_numpy(dtype=np.float64)[start:]
+    if recent_high.size and not (np.isnan(recent_high).any() or np.isnan(recent_low).any()):
+        high = recent_high.max()
+        low = recent_low.min()
+    else:
+        # 空数据或含 NaN 时沿用 pandas 的跳过 NaN 语义
+        high = df['high'].iloc[start:].max()
+        low = df['low'].iloc[start:].min()
     range_size = high - low
     
+    retracements = high - range_size * FIB_RATIOS
+    levels = dict(zip(FIB_RATIO_KEYS, retracements.tolist()))
+    levels['0.0'] = high
+    levels['1.0'] = low
+    
     fib_levels = {
         'high': high,
         'low': low,
         'range_size': range_size,
-        'levels': {
-            '0.0': high,
-            '0.236': high - (range_size * 0.236),
-            '0.382': high - (range_size * 0.382),
-            '0.5': high - (range_size * 0.5),
-            '0.618': high - (range_size * 0.618),
-            '0.786': high - (range_size * 0.786),
-            '1.0': low
-        }
+        'levels': levels
     }
     
     return fib_levels
 
+# calculate_all_indicators 追加的指标列（顺序与 _kernels.all_indicators 的输出行一致）
+INDICATOR_COLUMNS = (
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+    *(f'{kind}_{period}' for period in MA_PERIODS for kind in ('SMA', 'EMA')),
+    'BB_Upper', 'BB_Middle', 'BB_Lower', 'BB_Width', 'BB_Position',
+    'Stoch_K', 'Stoch_D', 'ATR'
+)
+
 def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """计算所有主要技术指标"""
-    # RSI
-    df['RSI'] = calculate_rsi(df, 14)
-    
-    # MACD
-    macd_line, macd_signal, macd_hist = calculate_macd(df)
-    df['MACD'] = macd_line
-    df['MACD_Signal'] = macd_signal
-    df['MACD_Histogram'] = macd_hist
-    
-    # 移动平均线
-    for period in [5, 10, 20, 50, 200]:
-        df[f'SMA_{period}'] = df['close'].rolling(window=period).mean()
-        df[f'EMA_{period}'] = df['close'].ewm(span=period, adjust=False).mean()
-    
-    # 布林带
-    bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(df)
-    df['BB_Upper'] = bb_upper
-    df['BB_Middle'] = bb_middle
-    df['BB_Lower'] = bb_lower
-    df['BB_Width'] = (bb_upper - bb_lower) / bb_middle
-    df['BB_Position'] = (df['close'] - bb_lower) / (bb_upper - bb_lower)
-    
-    # 随机指标
-    stoch_k, stoch_d = calculate_stochastic(df)
-    df['Stoch_K'] = stoch_k
-    df['Stoch_D'] = stoch_d
-    
-    # ATR
-    df['ATR'] = calculate_atr(df, 14)
-    
-    return df
+    """
+    计算所有主要技术指标
+
+    返回追加了 INDICATOR_COLUMNS 各列的新 DataFrame，不修改传入的 df。
+    全部指标先写入一个 (列数, n) 数组，再一次性拼接，避免逐列插入 DataFrame 的开销。
+    """
+    # 只取一次价格数组，各指标直接复用
+    close = _column(df, 'close')
+    high = _column(df, 'high')
+    low = _column(df, 'low')
+    
+    if NUMBA_AVAILABLE:
+        values = _kernels.all_indicators(high, low, close, MA_PERIODS_ARRAY)
+    else:
+        rows = [_rsi_arr(close, 14), *_macd_arr(close)]
+        for period in MA_PERIODS:
+            rows += [_rolling_mean_arr(close, period), _ewm_arr(close, 2 / (period + 1))]
+        
+        # 布林带：带宽差值只计算一次，位置在自身缓冲区内原地相除
+        bb_upper, bb_middle, bb_lower = _bb_arr(close)
+        band = bb_upper - bb_lower
+        position = close - bb_lower
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rows += [bb_upper, bb_middle, bb_lower,
+                     np.divide(band, bb_middle), np.divide(position, band, out=position)]
+        
+        rows += [*_stoch_arr(high, low, close), _atr_arr(high, low, close, 14)]
+        values = np.vstack(rows)
+    
+    indicators = pd.DataFrame(values.T, index=df.index, columns=INDICATOR_COLUMNS)
+    existing = [col for col in INDICATOR_COLUMNS if col in df.columns]
+    if existing:
+        df = df.drop(columns=existing)
+    return pd.concat([df, indicators], axis=1)
 
 # ==================== 数据获取和路由功能 ====================
 
+# 查找路由函数的候选模块
+_ROUTER_MODULES = (
+    'tradingagents.agents.utils.router',
+    'utils.router',
+    'router',
+    '.router'
+)
+# 找不到路由函数时，降级结果的复用时长（秒），之后重新查找
+ROUTER_RETRY_SECONDS = 60.0
+
+_router_cache = None  # (路由函数, 过期时间 monotonic；None 表示永久)
+
 def get_router_function():
     """
     安全获取路由函数
@@ -149,25 +365,32 @@ def get_router_function():
         
         return simulated_router
     
-    # 尝试多种导入方式
-    route_func = None
+    # 方式1: 模块加载时导入的路由函数（也可在运行时替换该全局变量注入）
+    if route_to_vendor is not None:
+        return route_to_vendor
     
-    # 方式1: 检查全局变量（如果已经注入）
-    if 'route_to_vendor' in globals():
-        route_func = globals()['route_to_vendor']
-        if callable(route_func) and route_func.__name__ != "route_to_vendor_placeholder":
-            logger.info("使用全局路由函数")
+    # 方式2/3 的查找结果会被缓存：成功结果永久复用，失败时的降级函数在重试间隔内复用
+    global _router_cache
+    cached = _router_cache
+    if cached is not None:
+        route_func, expires_at = cached
+        if expires_at is None or time.monotonic() < expires_at:
             return route_func
     
+    route_func = _resolve_router()
+    if route_func is not None:
+        _router_cache = (route_func, None)
+        return route_func
+    
+    # 如果都失败，返回一个警告函数
+    logger.warning("无法找到路由函数，使用降级模式")
+    _router_cache = (_fallback_router, time.monotonic() + ROUTER_RETRY_SECONDS)
+    return _fallback_router
+
+def _resolve_router():
+    """按常见路径及 sys.modules 查找 route_to_vendor，找不到返回 None"""
     # 方式2: 尝试从常见路径导入
-    possible_modules = [
-        'tradingagents.agents.utils.router',
-        'utils.router',
-        'router',
-        '.router'
-    ]
-    
-    for module_path in possible_modules:
+    for module_path in _ROUTER_MODULES:
         try:
             module = __import__(module_path, fromlist=['route_to_vendor'])
             route_func = getattr(module, 'route_to_vendor', None)
@@ -189,17 +412,15 @@ def get_router_function():
             except:
                 continue
     
-    # 如果都失败，返回一个警告函数
-    logger.warning("无法找到路由函数，使用降级模式")
-    
-    def fallback_router(*args, **kwargs):
-        return {
-            "success": False,
-            "error": "路由功能不可用，请检查配置或启用模拟模式",
-            "data": []
-        }
-    
-    return fallback_router
+    return None
+
+def _fallback_router(*args, **kwargs):
+    """路由函数不可用时的降级实现"""
+    return {
+        "success": False,
+        "error": "路由功能不可用，请检查配置或启用模拟模式",
+        "data": []
+    }
 
 def generate_simulated_data(symbol: str, start_date: str, end_date: str) -> Dict[str, Any]:
     """生成模拟价格数据"""
@@ -221,30 +442,35 @@ def generate_simulated_data(symbol: str, start_date: str, end_date: str) -> Dict
         
         # 生成日期序列
         date_range = pd.date_range(start=start_dt, end=end_dt, freq='D')
+        n = len(date_range)
         
-        data = []
-        current_price = base_price
+        # 一次性生成整段随机价格路径（收盘价为逐日涨跌的累乘）
+        close_price = base_price * np.cumprod(1 + np.random.normal(0, volatility, n))
+        open_price = close_price * (1 + np.random.normal(0, volatility * 0.5, n))
+        high_price = np.maximum(open_price, close_price) + np.abs(np.random.normal(0, volatility * 0.3, n))
+        low_price = np.minimum(open_price, close_price) - np.abs(np.random.normal(0, volatility * 0.3, n))
+        volume = np.random.randint(1000, 10000, n)
         
-        for i, date in enumerate(date_range):
-            # 随机价格变动
-            change = np.random.normal(0, volatility)
-            current_price = current_price * (1 + change)
-            
-            # 生成OHLC数据
-            open_price = current_price * (1 + np.random.normal(0, volatility * 0.5))
-            high_price = max(open_price, current_price) + abs(np.random.normal(0, volatility * 0.3))
-            low_price = min(open_price, current_price) - abs(np.random.normal(0, volatility * 0.3))
-            close_price = current_price
-            
-            data.append({
-                "datetime": date.strftime("%Y-%m-%d"),
-                "date": date.strftime("%Y-%m-%d"),
-                "open": round(open_price, 6),
-                "high": round(high_price, 6),
-                "low": round(low_price, 6),
-                "close": round(close_price, 6),
-                "volume": np.random.randint(1000, 10000)
-            })
+        dates = date_range.strftime("%Y-%m-%d").tolist()
+        data = [
+            {
+                "datetime": date,
+                "date": date,
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c,
+                "volume": v
+            }
+            for date, o, h, l, c, v in zip(
+                dates,
+                np.round(open_price, 6).tolist(),
+                np.round(high_price, 6).tolist(),
+                np.round(low_price, 6).tolist(),
+                np.round(close_price, 6).tolist(),
+                volume.tolist()
+            )
+        ]
         
         return {
             "success": True,
@@ -316,13 +542,88 @@ def parse_price_data(price_data: Any) -> Dict[str, Any]:
     if not data_points:
         return {"success": False, "error": "无数据点", "data": []}
     
+    # vendor 已解析好的 DataFrame（如 twelvedata）一并返回，调用方可跳过逐行重建
+    frame = price_data.get("dataframe") if isinstance(price_data, dict) else None
+    if isinstance(frame, pd.DataFrame) and not frame.empty:
+        return {"success": True, "data": data_points, "dataframe": frame}
+    
     return {"success": True, "data": data_points}
 
+def _parse_dates(values: pd.Series) -> pd.Series:
+    """
+    解析日期列
+
+    vendor 返回的日期均为 ISO 格式（yyyy-mm-dd 或 yyyy-mm-dd HH:MM:SS），
+    指定 format 可跳过逐元素的格式推断；非 ISO 数据回退到自动识别。
+    """
+    try:
+        return pd.to_datetime(values, format="ISO8601", cache=True)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, cache=True)
+
+# 技术数据结果缓存（进程内TTL缓存），同一轮决策中多个工具请求相同参数时复用，TECHNICAL_CACHE_TTL=0 可关闭
+TECHNICAL_CACHE_TTL = float(os.environ.get('TECHNICAL_CACHE_TTL', '60'))
+TECHNICAL_CACHE_MAXSIZE = 128
+
+_technical_cache: Dict[tuple, tuple] = {}
+_technical_cache_lock = threading.Lock()
+
+
+def clear_technical_cache() -> None:
+    """清空技术数据缓存"""
+    with _technical_cache_lock:
+        _technical_cache.clear()
+
+
 def get_technical_data(symbol: str, curr_date: str, look_back_days: int = 60) -> dict:
     """
     获取技术指标数据 - 修复版
     返回原始技术指标数据供分析使用
+
+    成功结果按 (symbol, curr_date, look_back_days) 缓存 TECHNICAL_CACHE_TTL 秒，
+    每次返回深拷贝，调用方修改结果不会影响缓存。
+    """
+    key = (symbol, curr_date, look_back_days)
+    if TECHNICAL_CACHE_TTL > 0:
+        with _technical_cache_lock:
+            entry = _technical_cache.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del _technical_cache[key]
+                entry = None
+        if entry is not None:
+            logger.debug(f"技术数据缓存命中: {symbol}, 日期: {curr_date}, 回溯: {look_back_days}天")
+            return copy.deepcopy(entry[1])
+
+    result = _compute_technical_data(symbol, curr_date, look_back_days)
+
+    # 只缓存成功结果，失败时下次调用重新请求
+    if TECHNICAL_CACHE_TTL > 0 and result.get("success"):
+        with _technical_cache_lock:
+            if key not in _technical_cache and len(_technical_cache) >= TECHNICAL_CACHE_MAXSIZE:
+                del _technical_cache[next(iter(_technical_cache))]
+            _technical_cache[key] = (time.monotonic() + TECHNICAL_CACHE_TTL, copy.deepcopy(result))
+    return result
+
+
+def get_technical_data_batch(symbols: List[str], curr_date: str, look_back_days: int = 60) -> Dict[str, dict]:
+    """
+    并发获取多个货币对的技术数据，返回 {symbol: get_technical_data 结果}
+
+    行情获取以IO为主，numba 内核计算时释放GIL，各货币对在线程池中互不等待；
+    结果与逐个调用 get_technical_data 相同（同样走缓存），按输入顺序排列，重复符号只计算一次。
     """
+    unique_symbols = list(dict.fromkeys(symbols))
+    if not unique_symbols:
+        return {}
+
+    # 使用独立线程池，避免与 SHARED_EXECUTOR 上的vendor调用互相等待
+    with ThreadPoolExecutor(max_workers=min(8, len(unique_symbols)), thread_name_prefix="tech-data") as pool:
+        results = pool.map(lambda symbol: get_technical_data(symbol, curr_date, look_back_days), unique_symbols)
+        return dict(zip(unique_symbols, results))
+
+
+def _compute_technical_data(symbol: str, curr_date: str, look_back_days: int) -> dict:
+    """获取价格数据并计算全部技术指标（不经过缓存）"""
     try:
         logger.info(f"获取技术数据: {symbol}, 日期: {curr_date}, 回溯: {look_back_days}天")
         
@@ -350,9 +651,10 @@ def get_technical_data(symbol: str, curr_date: str, look_back_days: int = 60) ->
         
         logger.info(f"成功获取 {len(data_points)} 个数据点")
         
-        # 转换为DataFrame
+        # 转换为DataFrame（优先复制 vendor 提供的列式 DataFrame，避免由逐行字典重建）
         try:
-            df = pd.DataFrame(data_points)
+            frame = parsed_data.get("dataframe")
+            df = frame.copy() if frame is not None else pd.DataFrame(data_points)
             logger.info(f"DataFrame创建成功，形状: {df.shape}")
         except Exception as e:
             logger.error(f"创建DataFrame失败: {e}")
@@ -365,7 +667,7 @@ def get_technical_data(symbol: str, curr_date: str, look_back_days: int = 60) ->
         for col in date_columns:
             if col in df.columns:
                 try:
-                    df[col] = pd.to_datetime(df[col])
+                    df[col] = _parse_dates(df[col])
                     df = df.sort_values(col).reset_index(drop=True)
                     date_col = col
                     logger.info(f"使用日期列: {col}")
@@ -377,29 +679,24 @@ def get_technical_data(symbol: str, curr_date: str, look_back_days: int = 60) ->
         if date_col is None:
             logger.warning("未找到日期列，使用索引作为时间序列")
         
-        # 标准化OHLC列名
-        column_mapping = {}
+        # 标准化OHLC列名：一次遍历建立小写列名索引，再按 x / xprice / x_price 查找
         ohlc_columns = ['open', 'high', 'low', 'close']
+        lower_columns = {}
+        for col in df.columns:
+            if isinstance(col, str):
+                lower_columns.setdefault(col.lower(), col)
         
+        column_mapping = {}
         for target_col in ohlc_columns:
-            # 检查标准小写
             if target_col in df.columns:
                 column_mapping[target_col] = target_col
-            else:
-                # 检查可能的变体
-                possible_names = [
-                    target_col.capitalize(),
-                    target_col.upper(),
-                    target_col.title(),
-                    f"{target_col.capitalize()}Price",
-                    f"{target_col.upper()}_PRICE"
-                ]
-                
-                for possible in possible_names:
-                    if possible in df.columns:
-                        column_mapping[target_col] = possible
-                        logger.info(f"映射 {target_col} -> {possible}")
-                        break
+                continue
+            source_col = (lower_columns.get(target_col)
+                          or lower_columns.get(f"{target_col}price")
+                          or lower_columns.get(f"{target_col}_price"))
+            if source_col is not None:
+                column_mapping[target_col] = source_col
+                logger.info(f"映射 {target_col} -> {source_col}")
         
         # 检查是否有缺失的必要列
         missing_cols = [col for col in ohlc_columns if col not in column_mapping]
@@ -413,23 +710,30 @@ def get_technical_data(symbol: str, curr_date: str, look_back_days: int = 60) ->
             
             return {"success": False, "error": f"缺少必要的价格列: {missing_cols}"}
         
-        # 应用列映射
-        for target_col, source_col in column_mapping.items():
-            if target_col != source_col:
-                df[target_col] = df[source_col]
+        # 应用列映射（重命名而非复制列，源列名不再残留在结果中）
+        renames = {source_col: target_col for target_col, source_col in column_mapping.items()
+                   if target_col != source_col}
+        if renames:
+            df = df.rename(columns=renames)
         
-        # 确保数值类型
-        for col in ohlc_columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+        # 确保数值类型（vendor 已给出 float64 时跳过转换）
+        if not (df[ohlc_columns].dtypes == np.float64).all():
+            df[ohlc_columns] = df[ohlc_columns].apply(pd.to_numeric, errors='coerce').astype(np.float64)
         
         # 检查并处理NaN值
-        nan_count = df[ohlc_columns].isna().sum().sum()
+        nan_count = int(np.isnan(df[ohlc_columns].to_numpy()).sum())
         if nan_count > 0:
             logger.warning(f"发现 {nan_count} 个NaN值，进行填充")
-            df[ohlc_columns] = df[ohlc_columns].ffill().bfill()
+            if NUMBA_AVAILABLE:
+                # 在一份连续的 (n, 4) 副本上原地前向+后向填充，避免 ffill/bfill 各复制一次整表
+                block = np.ascontiguousarray(df[ohlc_columns].to_numpy(dtype=np.float64))
+                _kernels.fill_nan_forward_backward(block)
+                df[ohlc_columns] = block
+            else:
+                df[ohlc_columns] = df[ohlc_columns].ffill().bfill()
             
             # 如果还有NaN，删除这些行
-            if df[ohlc_columns].isna().any().any():
+            if np.isnan(df[ohlc_columns].to_numpy()).any():
                 initial_len = len(df)
                 df = df.dropna(subset=ohlc_columns)
                 logger.warning(f"删除 {initial_len - len(df)} 行包含NaN的数据")
@@ -444,19 +748,13 @@ def get_technical_data(symbol: str, curr_date: str, look_back_days: int = 60) ->
         # 计算斐波那契水平
         fib_levels = calculate_fibonacci_levels(df_with_indicators, min(60, len(df_with_indicators)))
         
-        # 获取最新指标值
-        latest_indicators = {}
-        indicator_columns = [col for col in df_with_indicators.columns 
-                           if col not in (ohlc_columns + [date_col] + ['volume', 'Volume']) 
-                           and pd.api.types.is_numeric_dtype(df_with_indicators[col])]
-        
-        for col in indicator_columns:
-            try:
-                value = df_with_indicators[col].iloc[-1]
-                if not pd.isna(value):
-                    latest_indicators[col] = float(value)
-            except Exception as e:
-                logger.warning(f"获取指标 {col} 失败: {e}")
+        # 获取最新指标值：按 dtype 一次选出数值列，只取最后一行
+        excluded = set(ohlc_columns + [date_col] + ['volume', 'Volume'])
+        numeric = df_with_indicators.select_dtypes(include=['number', 'bool'], exclude=['timedelta'])
+        indicator_columns = [col for col in numeric.columns if col not in excluded]
+        last_row = numeric[indicator_columns].iloc[-1].to_numpy(dtype=np.float64)
+        latest_indicators = {col: float(value) for col, value in zip(indicator_columns, last_row)
+                             if not np.isnan(value)}
         
         # 准备返回结果
         result = {
@@ -489,6 +787,327 @@ def get_technical_data(symbol: str, curr_date: str, look_back_days: int = 60) ->
 
 # ==================== LangChain 工具函数 ====================
 
+# 斐波那契水平说明（水平列表与当前位置分析中的措辞不同）
+FIB_LEVEL_LABELS = {
+    '0.0': '起点 (高点)',
+    '0.236': '浅度回撤',
+    '0.382': '重要回撤',
+    '0.5': '50%回撤',
+    '0.618': '黄金分割',
+    '0.786': '深度回撤',
+    '1.0': '终点 (低点)'
+}
+FIB_LEVEL_NOTES = {
+    '0.0': '起点高点',
+    '0.236': '浅度回撤位',
+    '0.382': '重要回撤位',
+    '0.5': '50%回撤位',
+    '0.618': '黄金分割位',
+    '0.786': '深度回撤位',
+    '1.0': '终点低点'
+}
+
+
+# 技术指标分类（按显示顺序），移动平均线列由 MA_PERIODS 固定生成
+_CATEGORY_TEMPLATE = {
+    "动量指标": ("RSI", "Stoch_K", "Stoch_D"),
+    "趋势指标": ("MACD", "MACD_Signal", "MACD_Histogram"),
+    "移动平均线": tuple(f"{kind}_{period}" for kind in ("SMA", "EMA") for period in MA_PERIODS),
+    "波动指标": ("BB_Upper", "BB_Middle", "BB_Lower", "BB_Width", "BB_Position", "ATR")
+}
+
+
+def _format_indicator_lines(names, latest_indicators: dict) -> List[str]:
+    """按给定顺序格式化 latest_indicators 中存在的指标"""
+    return [f"- **{name}**: {latest_indicators[name]:.6f}" for name in names if name in latest_indicators]
+
+
+# ---------- get_indicators 各指标：先计算结构化状态，再渲染为说明行 ----------
+
+def _zone_thresholds(low: float, high: float) -> tuple:
+    """
+    超买超卖分档阈值，配合 bisect_right 使用：
+    value < low → 0，low <= value <= high → 1，value > high → 2
+    （latest_indicators 已剔除 NaN，状态函数不会收到 NaN）
+    """
+    return (low, math.nextafter(high, math.inf))
+
+# 分档阈值、档位名与对应的 (信号, 建议) 行
+_OVERBOUGHT_ZONES = ('oversold', 'neutral', 'overbought')
+_RSI_ZONES = _zone_thresholds(30, 70)
+_RSI_SIGNALS = {
+    'oversold': ("- **信号**: 🔴 超卖区域 (可能反弹)", "- **建议**: 考虑买入机会"),
+    'neutral': ("- **信号**: ⚪ 正常范围", "- **建议**: 观望或结合其他指标"),
+    'overbought': ("- **信号**: 🟢 超买区域 (可能回调)", "- **建议**: 考虑卖出机会")
+}
+_BB_POSITION_NAMES = ('near_lower', 'middle', 'near_upper')
+_BB_POSITION_ZONES = _zone_thresholds(0.2, 0.8)
+_BB_POSITION_SIGNALS = {
+    'near_lower': ("- **信号**: 🟢 接近下轨 (可能反弹)", "- **建议**: 潜在买入机会"),
+    'middle': ("- **信号**: ⚪ 中轨附近", "- **建议**: 观望"),
+    'near_upper': ("- **信号**: 🔴 接近上轨 (可能回调)", "- **建议**: 潜在卖出机会")
+}
+_STOCH_ZONES = _zone_thresholds(20, 80)
+_STOCH_SIGNALS = {
+    'oversold': ("- **信号**: 🟢 超卖区域 (可能反弹)", "- **建议**: 考虑买入"),
+    'neutral': ("- **信号**: ⚪ 正常范围", "- **建议**: 观望"),
+    'overbought': ("- **信号**: 🔴 超买区域 (可能回调)", "- **建议**: 考虑卖出")
+}
+_MACD_SIGNALS = {
+    'bullish': ("- **信号**: 🟢 金叉信号 (看涨)", "- **建议**: 考虑做多"),
+    'bearish': ("- **信号**: 🔴 死叉信号 (看跌)", "- **建议**: 考虑做空")
+}
+_TREND_SIGNALS = {
+    'bullish': "- **信号**: 🟢 看涨趋势",
+    'bearish': "- **信号**: 🔴 看跌趋势"
+}
+
+# 各指标的说明行，按状态类型索引
+_INDICATOR_NOTES = {
+    'rsi': "- **说明**: 14周期相对强弱指数，衡量价格动量",
+    'macd': "- **说明**: 趋势动量指标",
+    'sma': "- **说明**: 简单移动平均线，趋势方向指标",
+    'ema': "- **说明**: 指数移动平均线，对近期价格更敏感",
+    'bollinger': "- **说明**: 波动率和价格位置指标",
+    'stochastic': "- **说明**: 动量振荡器，超买超卖指标",
+    'atr': "- **说明**: 平均真实波幅，衡量价格波动性"
+}
+
+# 波动率分档（严格大于阈值才升档，配合 bisect_left 使用）
+_VOLATILITY_LEVELS = ('low', 'medium', 'high')
+_VOLATILITY_LABELS = {'low': '低', 'medium': '中等', 'high': '高'}
+_BB_WIDTH_THRESHOLDS = (0.02, 0.05)
+_ATR_PCT_THRESHOLDS = (0.5, 1.0)
+
+
+def _rsi_state(latest_indicators: dict, current_price: float) -> Optional[dict]:
+    rsi_value = latest_indicators.get('RSI')
+    if rsi_value is None:
+        return None
+    return {
+        'type': 'rsi',
+        'value': rsi_value,
+        'signal': _OVERBOUGHT_ZONES[bisect_right(_RSI_ZONES, rsi_value)]
+    }
+
+
+def _macd_state(latest_indicators: dict, current_price: float) -> Optional[dict]:
+    macd_val = latest_indicators.get('MACD')
+    macd_signal = latest_indicators.get('MACD_Signal')
+    if macd_val is None or macd_signal is None:
+        return None
+    hist = latest_indicators.get('MACD_Histogram')
+    return {
+        'type': 'macd',
+        'value': macd_val,
+        'signal_line': macd_signal,
+        'difference': macd_val - macd_signal,
+        'histogram': hist,
+        'momentum': None if hist is None else ('rising' if hist > 0 else 'falling'),
+        'signal': 'bullish' if macd_val > macd_signal else 'bearish'
+    }
+
+
+def _sma_state(latest_indicators: dict, current_price: float, period: str) -> Optional[dict]:
+    sma_value = latest_indicators.get(f'SMA_{period}')
+    if sma_value is None or sma_value == 0:
+        return None
+    above = current_price > sma_value
+    return {
+        'type': 'sma',
+        'period': period,
+        'value': sma_value,
+        'price_position': 'above' if above else 'below',
+        'distance_pct': abs(current_price - sma_value) / sma_value * 100,
+        'signal': 'bullish' if above else 'bearish'
+    }
+
+
+def _ema_state(latest_indicators: dict, current_price: float, period: str) -> Optional[dict]:
+    ema_value = latest_indicators.get(f'EMA_{period}')
+    if ema_value is None:
+        return None
+    return {
+        'type': 'ema',
+        'period': period,
+        'value': ema_value,
+        'price_position': 'above' if current_price > ema_value else 'below'
+    }
+
+
+def _bollinger_state(latest_indicators: dict, current_price: float) -> Optional[dict]:
+    bb_upper = latest_indicators.get('BB_Upper')
+    bb_middle = latest_indicators.get('BB_Middle')
+    bb_lower = latest_indicators.get('BB_Lower')
+    if bb_upper is None or bb_middle is None or bb_lower is None:
+        return None
+    bb_position = latest_indicators.get('BB_Position')
+    bb_width = latest_indicators.get('BB_Width')
+    return {
+        'type': 'bollinger',
+        'upper': bb_upper,
+        'middle': bb_middle,
+        'lower': bb_lower,
+        'position': bb_position,
+        'signal': None if bb_position is None else _BB_POSITION_NAMES[bisect_right(_BB_POSITION_ZONES, bb_position)],
+        'width': bb_width,
+        'volatility': None if bb_width is None else _VOLATILITY_LEVELS[bisect_left(_BB_WIDTH_THRESHOLDS, bb_width)]
+    }
+
+
+def _stochastic_state(latest_indicators: dict, current_price: float) -> Optional[dict]:
+    stoch_k = latest_indicators.get('Stoch_K')
+    stoch_d = latest_indicators.get('Stoch_D')
+    if stoch_k is None or stoch_d is None:
+        return None
+    # %K 与 %D 同处超买/超卖区时才给出信号
+    zone = bisect_right(_STOCH_ZONES, stoch_k)
+    if bisect_right(_STOCH_ZONES, stoch_d) != zone:
+        zone = 1
+    return {
+        'type': 'stochastic',
+        'k': stoch_k,
+        'd': stoch_d,
+        'signal': _OVERBOUGHT_ZONES[zone]
+    }
+
+
+def _atr_state(latest_indicators: dict, current_price: float) -> Optional[dict]:
+    atr_value = latest_indicators.get('ATR')
+    if atr_value is None:
+        return None
+    atr_pct = atr_value / current_price * 100
+    return {
+        'type': 'atr',
+        'value': atr_value,
+        'pct': atr_pct,
+        'volatility': _VOLATILITY_LEVELS[bisect_left(_ATR_PCT_THRESHOLDS, atr_pct)]
+    }
+
+
+# 指标名（小写）→ 状态函数，导入时构建一次
+_INDICATOR_HANDLERS = {
+    'rsi': _rsi_state,
+    'macd': _macd_state,
+    'bb': _bollinger_state,
+    'bollinger': _bollinger_state,
+    'stoch': _stochastic_state,
+    'stochastic': _stochastic_state,
+    'atr': _atr_state
+}
+# 带周期参数的指标（sma_N / ema_N）
+_PERIOD_INDICATOR_HANDLERS = {
+    'sma': _sma_state,
+    'ema': _ema_state
+}
+
+
+def _indicator_state(indicator_lower: str, latest_indicators: dict, current_price: float) -> Optional[dict]:
+    """按指标名查表计算状态；未知指标或数据缺失时返回 None"""
+    handler = _INDICATOR_HANDLERS.get(indicator_lower)
+    if handler is not None:
+        return handler(latest_indicators, current_price)
+    kind, sep, period = indicator_lower.partition('_')
+    handler = _PERIOD_INDICATOR_HANDLERS.get(kind) if sep else None
+    if handler is not None:
+        return handler(latest_indicators, current_price, period)
+    return None
+
+
+def _render_rsi(state: dict) -> Tuple[str, ...]:
+    return (
+        f"- **当前值**: {state['value']:.2f}",
+        *_RSI_SIGNALS[state['signal']],
+        _INDICATOR_NOTES['rsi']
+    )
+
+
+def _render_macd(state: dict) -> Tuple[str, ...]:
+    hist = state['histogram']
+    hist_lines = () if hist is None else (
+        f"- **柱状图**: {hist:.6f}",
+        f"- **动量**: {'增强' if state['momentum'] == 'rising' else '减弱'}"
+    )
+    return (
+        f"- **MACD线**: {state['value']:.6f}",
+        f"- **信号线**: {state['signal_line']:.6f}",
+        f"- **差值**: {state['difference']:.6f}",
+        *_MACD_SIGNALS[state['signal']],
+        *hist_lines,
+        _INDICATOR_NOTES['macd']
+    )
+
+
+def _render_sma(state: dict) -> Tuple[str, ...]:
+    above = state['price_position'] == 'above'
+    return (
+        f"- **{state['period']}周期SMA**: {state['value']:.6f}",
+        f"- **与当前价关系**: 当前价在SMA{'上方' if above else '下方'} ({state['distance_pct']:.2f}%)",
+        _TREND_SIGNALS[state['signal']],
+        _INDICATOR_NOTES['sma']
+    )
+
+
+def _render_ema(state: dict) -> Tuple[str, ...]:
+    return (
+        f"- **{state['period']}周期EMA**: {state['value']:.6f}",
+        f"- **与当前价关系**: 当前价在EMA{'上方' if state['price_position'] == 'above' else '下方'}",
+        _INDICATOR_NOTES['ema']
+    )
+
+
+def _render_bollinger(state: dict) -> Tuple[str, ...]:
+    bb_position = state['position']
+    position_lines = () if bb_position is None else (
+        f"- **位置**: {bb_position:.2%}",
+        *_BB_POSITION_SIGNALS[state['signal']]
+    )
+    
+    bb_width = state['width']
+    width_lines = () if bb_width is None else (
+        f"- **带宽**: {bb_width:.4f}",
+        f"- **波动率**: {_VOLATILITY_LABELS[state['volatility']]}"
+    )
+    
+    return (
+        f"- **上轨**: {state['upper']:.6f}",
+        f"- **中轨**: {state['middle']:.6f}",
+        f"- **下轨**: {state['lower']:.6f}",
+        *position_lines,
+        *width_lines,
+        _INDICATOR_NOTES['bollinger']
+    )
+
+
+def _render_stochastic(state: dict) -> Tuple[str, ...]:
+    return (
+        f"- **%K线**: {state['k']:.2f}",
+        f"- **%D线**: {state['d']:.2f}",
+        *_STOCH_SIGNALS[state['signal']],
+        _INDICATOR_NOTES['stochastic']
+    )
+
+
+def _render_atr(state: dict) -> Tuple[str, ...]:
+    return (
+        f"- **ATR值**: {state['value']:.6f}",
+        f"- **波动率**: {_VOLATILITY_LABELS[state['volatility']]} ({state['pct']:.2f}%)",
+        _INDICATOR_NOTES['atr']
+    )
+
+
+# 状态类型 → 渲染函数
+_INDICATOR_RENDERERS = {
+    'rsi': _render_rsi,
+    'macd': _render_macd,
+    'sma': _render_sma,
+    'ema': _render_ema,
+    'bollinger': _render_bollinger,
+    'stochastic': _render_stochastic,
+    'atr': _render_atr
+}
+
+
 @tool
 def get_technical_indicators_data(
     symbol: Annotated[str, "外汇货币对符号, 例如: EUR/USD, GBP/JPY, XAU/USD"],
@@ -513,12 +1132,25 @@ def get_technical_indicators_data(
         # 准备输出
         current_price = tech_data["current_price"]
         latest_indicators = tech_data["latest_indicators"]
+        metadata = tech_data.get('metadata', {})
         
-        output_lines = [
+        # 分类显示技术指标
+        category_lines = [
+            line
+            for category, indicators in _CATEGORY_TEMPLATE.items()
+            for lines in (_format_indicator_lines(indicators, latest_indicators),) if lines
+            for line in (f"### {category}", *lines, "")
+        ]
+        
+        # 如果指标较少，显示所有可用指标
+        if len(latest_indicators) < 5:
+            category_lines += ["### 所有可用指标", *_format_indicator_lines(latest_indicators, latest_indicators), ""]
+        
+        return "\n".join([
             f"# 📊 技术指标数据 - {symbol}",
             f"**分析日期**: {curr_date} | **回溯周期**: {look_back_days}天",
             f"**数据点数**: {tech_data['data_points']}",
-            f"**数据来源**: {'模拟数据' if tech_data.get('metadata', {}).get('simulated') else '真实数据'}",
+            f"**数据来源**: {'模拟数据' if metadata.get('simulated') else '真实数据'}",
             "",
             "## 💰 价格信息",
             f"- **当前价格**: {current_price:.6f}",
@@ -526,47 +1158,15 @@ def get_technical_indicators_data(
             f"- **期间最高**: {tech_data['price_data']['high']:.6f}",
             f"- **期间最低**: {tech_data['price_data']['low']:.6f}",
             "",
-            "## 📈 技术指标数值"
-        ]
-        
-        # 分类显示技术指标
-        indicator_categories = {
-            "动量指标": ["RSI", "Stoch_K", "Stoch_D"],
-            "趋势指标": ["MACD", "MACD_Signal", "MACD_Histogram"],
-            "移动平均线": sorted([col for col in latest_indicators.keys() 
-                               if col.startswith(('SMA_', 'EMA_'))]),
-            "波动指标": ["BB_Upper", "BB_Middle", "BB_Lower", "BB_Width", "BB_Position", "ATR"]
-        }
-        
-        for category, indicators in indicator_categories.items():
-            category_lines = []
-            for indicator in indicators:
-                if indicator in latest_indicators:
-                    value = latest_indicators[indicator]
-                    category_lines.append(f"- **{indicator}**: {value:.6f}")
-            
-            if category_lines:
-                output_lines.append(f"### {category}")
-                output_lines.extend(category_lines)
-                output_lines.append("")
-        
-        # 如果指标较少，显示所有可用指标
-        if len(latest_indicators) < 5:
-            output_lines.append("### 所有可用指标")
-            for indicator, value in latest_indicators.items():
-                output_lines.append(f"- **{indicator}**: {value:.6f}")
-            output_lines.append("")
-        
-        output_lines.extend([
+            "## 📈 技术指标数值",
+            *category_lines,
             "## 💡 使用说明",
             "- 以上为技术指标原始数值",
             "- 请结合价格行为进行综合分析",
-            f"- 数据期间: {tech_data.get('metadata', {}).get('date_range', '未知')}",
+            f"- 数据期间: {metadata.get('date_range', '未知')}",
             ""
         ])
         
-        return "\n".join(output_lines)
-        
     except Exception as e:
         return f"❌ 获取技术指标数据失败: {str(e)}"
 
@@ -594,6 +1194,7 @@ def get_fibonacci_levels(
             return "❌ 无法计算斐波那契水平"
         
         current_price = tech_data["current_price"]
+        sorted_levels = sorted(fib_levels['levels'].items(), key=lambda x: float(x[0]))
         
         output_lines = [
             f"# 📐 斐波那契回撤水平 - {symbol}",
@@ -602,49 +1203,28 @@ def get_fibonacci_levels(
             f"**计算区间**: {look_back_days}天",
             f"**数据来源**: {'模拟数据' if tech_data.get('metadata', {}).get('simulated') else '真实数据'}",
             "",
-            "## 关键水平位:"
+            "## 关键水平位:",
+            # 标记当前价格相对于水平的位置
+            *[
+                f"- **{level} ({FIB_LEVEL_LABELS.get(level, level)})**: {value:.6f} "
+                f"[{'上方' if current_price > value else '下方' if current_price < value else '正好在'}]"
+                for level, value in sorted_levels
+            ]
         ]
         
         # 找出当前价格最近的斐波那契水平
         closest_level = None
         min_distance = float('inf')
-        
-        levels = fib_levels['levels']
-        sorted_levels = sorted(levels.items(), key=lambda x: float(x[0]))
-        
         for level, value in sorted_levels:
             distance = abs(current_price - value)
             if distance < min_distance:
                 min_distance = distance
                 closest_level = (level, value)
-            
-            level_desc = {
-                '0.0': '起点 (高点)',
-                '0.236': '浅度回撤',
-                '0.382': '重要回撤',
-                '0.5': '50%回撤',
-                '0.618': '黄金分割',
-                '0.786': '深度回撤', 
-                '1.0': '终点 (低点)'
-            }.get(level, level)
-            
-            # 标记当前价格相对于水平的位置
-            position = "上方" if current_price > value else "下方" if current_price < value else "正好在"
-            output_lines.append(f"- **{level} ({level_desc})**: {value:.6f} [{position}]")
         
         if closest_level:
             level, value = closest_level
-            level_desc = {
-                '0.0': '起点高点',
-                '0.236': '浅度回撤位',
-                '0.382': '重要回撤位',
-                '0.5': '50%回撤位',
-                '0.618': '黄金分割位',
-                '0.786': '深度回撤位',
-                '1.0': '终点低点'
-            }.get(level, level)
-            
-            output_lines.extend([
+            level_desc = FIB_LEVEL_NOTES.get(level, level)
+            output_lines += [
                 "",
                 "## 📍 当前位置分析",
                 f"**最接近水平**: {level} ({level_desc})",
@@ -656,13 +1236,48 @@ def get_fibonacci_levels(
                 f"- **{level}水平**: {level_desc}",
                 "- **作用**: 潜在的支撑/阻力位",
                 "- **建议**: 观察价格在该水平的反应"
-            ])
+            ]
         
         return "\n".join(output_lines)
         
     except Exception as e:
         return f"❌ 获取斐波那契水平失败: {str(e)}"
 
+def get_indicators_structured(symbol: str, indicators: List[str], end_date: str,
+                              look_back_days: int = 60) -> dict:
+    """
+    计算指定技术指标的结构化状态，不生成 Markdown
+    
+    供程序化调用方直接使用（结果可直接 JSON 序列化），get_indicators 在此基础上渲染文本。
+    indicators 中每个名称对应一个状态字典（含 type、数值及 signal 等分类），
+    未知指标或数据缺失时为 None。
+    """
+    tech_data = get_technical_data(symbol, end_date, look_back_days)
+    if not tech_data["success"]:
+        return {"success": False, "error": tech_data.get("error", "未知错误")}
+    
+    current_price = tech_data["current_price"]
+    latest_indicators = tech_data["latest_indicators"]
+    metadata = tech_data.get('metadata', {})
+    if latest_indicators:
+        states = {
+            indicator: _indicator_state(indicator.lower().strip(), latest_indicators, current_price)
+            for indicator in indicators
+        }
+    else:
+        # 没有任何有效指标值时无需逐个分派
+        states = dict.fromkeys(indicators)
+    return {
+        "success": True,
+        "symbol": symbol,
+        "current_price": current_price,
+        "indicators": states,
+        "latest_indicators": latest_indicators,
+        "data_points": tech_data["data_points"],
+        "date_range": metadata.get('date_range', '未知'),
+        "simulated": bool(metadata.get('simulated'))
+    }
+
 @tool
 def get_indicators(
     symbol: Annotated[str, "外汇货币对符号, 例如: EUR/USD, GBP/JPY, XAU/USD"],
@@ -686,199 +1301,54 @@ def get_indicators(
     get_indicators("EUR/USD", ["rsi", "macd"], "2024-01-15", 30)
     """
     try:
-        # 获取技术数据
-        tech_data = get_technical_data(symbol, end_date, look_back_days)
+        structured = get_indicators_structured(symbol, indicators, end_date, look_back_days)
         
-        if not tech_data["success"]:
-            error_msg = tech_data.get("error", "未知错误")
-            return f"❌ 无法获取 {symbol} 数据: {error_msg}"
+        if not structured["success"]:
+            return f"❌ 无法获取 {symbol} 数据: {structured['error']}"
         
-        current_price = tech_data["current_price"]
-        latest_indicators = tech_data["latest_indicators"]
+        current_price = structured["current_price"]
+        latest_indicators = structured["latest_indicators"]
+        states = structured["indicators"]
         
         # 构建响应
         output_lines = [
             f"# 📊 技术指标计算 - {symbol}",
             f"**结束日期**: {end_date} | **回溯天数**: {look_back_days}",
             f"**当前价格**: {current_price:.6f}",
-            f"**数据来源**: {'模拟数据' if tech_data.get('metadata', {}).get('simulated') else '真实数据'}",
+            f"**数据来源**: {'模拟数据' if structured['simulated'] else '真实数据'}",
             f"**请求指标**: {', '.join(indicators)}",
             ""
         ]
         
+        # 可用指标名只排序一次，供未找到提示与兜底列表共用
+        available_names = sorted(latest_indicators)
+        available_text = ', '.join(available_names)
+        
         # 为每个请求的指标提供详细分析
         indicators_found = 0
         for indicator in indicators:
-            indicator_lower = indicator.lower().strip()
             output_lines.append(f"## 🔧 {indicator.upper()} 指标")
-            
-            found = False
-            
-            # RSI
-            if indicator_lower == 'rsi' and 'RSI' in latest_indicators:
-                rsi_value = latest_indicators['RSI']
-                output_lines.append(f"- **当前值**: {rsi_value:.2f}")
-                if rsi_value < 30:
-                    output_lines.append("- **信号**: 🔴 超卖区域 (可能反弹)")
-                    output_lines.append("- **建议**: 考虑买入机会")
-                elif rsi_value > 70:
-                    output_lines.append("- **信号**: 🟢 超买区域 (可能回调)")
-                    output_lines.append("- **建议**: 考虑卖出机会")
-                else:
-                    output_lines.append("- **信号**: ⚪ 正常范围")
-                    output_lines.append("- **建议**: 观望或结合其他指标")
-                output_lines.append("- **说明**: 14周期相对强弱指数，衡量价格动量")
-                found = True
-            
-            # MACD
-            elif indicator_lower == 'macd':
-                macd_val = latest_indicators.get('MACD')
-                macd_signal = latest_indicators.get('MACD_Signal')
-                if macd_val is not None and macd_signal is not None:
-                    output_lines.append(f"- **MACD线**: {macd_val:.6f}")
-                    output_lines.append(f"- **信号线**: {macd_signal:.6f}")
-                    output_lines.append(f"- **差值**: {(macd_val - macd_signal):.6f}")
-                    
-                    if macd_val > macd_signal:
-                        output_lines.append("- **信号**: 🟢 金叉信号 (看涨)")
-                        output_lines.append("- **建议**: 考虑做多")
-                    else:
-                        output_lines.append("- **信号**: 🔴 死叉信号 (看跌)")
-                        output_lines.append("- **建议**: 考虑做空")
-                    
-                    hist = latest_indicators.get('MACD_Histogram')
-                    if hist is not None:
-                        output_lines.append(f"- **柱状图**: {hist:.6f}")
-                        output_lines.append(f"- **动量**: {'增强' if hist > 0 else '减弱'}")
-                    
-                    output_lines.append("- **说明**: 趋势动量指标")
-                    found = True
-            
-            # SMA
-            elif indicator_lower.startswith('sma_'):
-                try:
-                    period = indicator_lower.replace('sma_', '')
-                    sma_key = f'SMA_{period}'
-                    if sma_key in latest_indicators:
-                        sma_value = latest_indicators[sma_key]
-                        output_lines.append(f"- **{period}周期SMA**: {sma_value:.6f}")
-                        
-                        relation = "上方" if current_price > sma_value else "下方"
-                        distance_pct = abs(current_price - sma_value) / sma_value * 100
-                        output_lines.append(f"- **与当前价关系**: 当前价在SMA{relation} ({distance_pct:.2f}%)")
-                        
-                        if current_price > sma_value:
-                            output_lines.append("- **信号**: 🟢 看涨趋势")
-                        else:
-                            output_lines.append("- **信号**: 🔴 看跌趋势")
-                        
-                        output_lines.append("- **说明**: 简单移动平均线，趋势方向指标")
-                        found = True
-                except:
-                    pass
-            
-            # EMA
-            elif indicator_lower.startswith('ema_'):
-                try:
-                    period = indicator_lower.replace('ema_', '')
-                    ema_key = f'EMA_{period}'
-                    if ema_key in latest_indicators:
-                        ema_value = latest_indicators[ema_key]
-                        output_lines.append(f"- **{period}周期EMA**: {ema_value:.6f}")
-                        
-                        relation = "上方" if current_price > ema_value else "下方"
-                        output_lines.append(f"- **与当前价关系**: 当前价在EMA{relation}")
-                        
-                        output_lines.append("- **说明**: 指数移动平均线，对近期价格更敏感")
-                        found = True
-                except:
-                    pass
-            
-            # 布林带
-            elif indicator_lower == 'bollinger' or indicator_lower == 'bb':
-                bb_upper = latest_indicators.get('BB_Upper')
-                bb_middle = latest_indicators.get('BB_Middle')
-                bb_lower = latest_indicators.get('BB_Lower')
-                bb_position = latest_indicators.get('BB_Position')
-                
-                if all(v is not None for v in [bb_upper, bb_middle, bb_lower]):
-                    output_lines.append(f"- **上轨**: {bb_upper:.6f}")
-                    output_lines.append(f"- **中轨**: {bb_middle:.6f}")
-                    output_lines.append(f"- **下轨**: {bb_lower:.6f}")
-                    
-                    if bb_position is not None:
-                        output_lines.append(f"- **位置**: {bb_position:.2%}")
-                        if bb_position < 0.2:
-                            output_lines.append("- **信号**: 🟢 接近下轨 (可能反弹)")
-                            output_lines.append("- **建议**: 潜在买入机会")
-                        elif bb_position > 0.8:
-                            output_lines.append("- **信号**: 🔴 接近上轨 (可能回调)")
-                            output_lines.append("- **建议**: 潜在卖出机会")
-                        else:
-                            output_lines.append("- **信号**: ⚪ 中轨附近")
-                            output_lines.append("- **建议**: 观望")
-                    
-                    bb_width = latest_indicators.get('BB_Width')
-                    if bb_width is not None:
-                        output_lines.append(f"- **带宽**: {bb_width:.4f}")
-                        output_lines.append(f"- **波动率**: {'高' if bb_width > 0.05 else '中等' if bb_width > 0.02 else '低'}")
-                    
-                    output_lines.append("- **说明**: 波动率和价格位置指标")
-                    found = True
-            
-            # 随机指标
-            elif indicator_lower == 'stoch' or indicator_lower == 'stochastic':
-                stoch_k = latest_indicators.get('Stoch_K')
-                stoch_d = latest_indicators.get('Stoch_D')
-                
-                if stoch_k is not None and stoch_d is not None:
-                    output_lines.append(f"- **%K线**: {stoch_k:.2f}")
-                    output_lines.append(f"- **%D线**: {stoch_d:.2f}")
-                    
-                    if stoch_k < 20 and stoch_d < 20:
-                        output_lines.append("- **信号**: 🟢 超卖区域 (可能反弹)")
-                        output_lines.append("- **建议**: 考虑买入")
-                    elif stoch_k > 80 and stoch_d > 80:
-                        output_lines.append("- **信号**: 🔴 超买区域 (可能回调)")
-                        output_lines.append("- **建议**: 考虑卖出")
-                    else:
-                        output_lines.append("- **信号**: ⚪ 正常范围")
-                        output_lines.append("- **建议**: 观望")
-                    
-                    output_lines.append("- **说明**: 动量振荡器，超买超卖指标")
-                    found = True
-            
-            # ATR
-            elif indicator_lower == 'atr':
-                atr_value = latest_indicators.get('ATR')
-                if atr_value is not None:
-                    output_lines.append(f"- **ATR值**: {atr_value:.6f}")
-                    
-                    atr_pct = atr_value / current_price * 100
-                    volatility = '高' if atr_pct > 1.0 else '中等' if atr_pct > 0.5 else '低'
-                    output_lines.append(f"- **波动率**: {volatility} ({atr_pct:.2f}%)")
-                    
-                    output_lines.append("- **说明**: 平均真实波幅，衡量价格波动性")
-                    found = True
-            
+            state = states[indicator]
+            if state is None:
+                output_lines.extend((
+                    f"- **状态**: ⚠️ 指标 '{indicator}' 未找到或不可用",
+                    f"- **可用指标**: {available_text}"
+                ))
             else:
-                output_lines.append(f"- **状态**: ⚠️ 指标 '{indicator}' 未找到或不可用")
-                output_lines.append(f"- **可用指标**: {', '.join(sorted(latest_indicators.keys()))}")
-            
-            if found:
+                output_lines.extend(_INDICATOR_RENDERERS[state['type']](state))
                 indicators_found += 1
-            
             output_lines.append("")  # 空行分隔
         
         # 如果没有找到任何指标
         if indicators_found == 0:
-            output_lines.append("## ⚠️ 未找到请求的指标")
-            output_lines.append("可用的指标包括:")
-            for indicator in sorted(latest_indicators.keys()):
-                output_lines.append(f"- {indicator}: {latest_indicators[indicator]:.6f}")
-            output_lines.append("")
+            output_lines.extend((
+                "## ⚠️ 未找到请求的指标",
+                "可用的指标包括:",
+                *[f"- {name}: {latest_indicators[name]:.6f}" for name in available_names],
+                ""
+            ))
         
-        output_lines.extend([
+        output_lines.extend((
             "## 💡 综合分析建议",
             f"- **找到指标**: {indicators_found}/{len(indicators)}",
             "- **建议**: 结合多个指标确认交易信号",
@@ -886,34 +1356,64 @@ def get_indicators(
             "- **风险**: 使用ATR设置止损水平",
             "",
             "## 📊 数据质量",
-            f"- **数据点**: {tech_data['data_points']}",
-            f"- **数据期间**: {tech_data.get('metadata', {}).get('date_range', '未知')}",
-            f"- **数据来源**: {'模拟数据 - 仅用于测试' if tech_data.get('metadata', {}).get('simulated') else '真实数据'}"
-        ])
+            f"- **数据点**: {structured['data_points']}",
+            f"- **数据期间**: {structured['date_range']}",
+            f"- **数据来源**: {'模拟数据 - 仅用于测试' if structured['simulated'] else '真实数据'}"
+        ))
         
         return "\n".join(output_lines)
         
     except Exception as e:
         return f"❌ 技术指标计算失败: {str(e)}"
 
+@tool
+def get_technical_indicators_data_batch(
+    symbols: Annotated[List[str], "外汇货币对符号列表, 例如: ['EUR/USD', 'GBP/JPY']"],
+    curr_date: Annotated[str, "当前交易日期, 格式 YYYY-mm-dd"],
+    look_back_days: Annotated[int, "回溯天数, 默认60天"] = 60
+) -> str:
+    """
+    批量获取多个货币对的技术指标原始数据，一次调用代替多次 get_technical_indicators_data。
+    各货币对并发获取与计算，按输入顺序返回，各段之间以分隔线隔开。
+    
+    示例:
+    get_technical_indicators_data_batch(["EUR/USD", "GBP/USD"], "2024-01-15", 30)
+    """
+    unique_symbols = list(dict.fromkeys(symbols))
+    if not unique_symbols:
+        return "❌ 未提供货币对"
+    
+    # 行情获取以IO为主，numba 内核计算时释放GIL，线程池即可并行；
+    # 使用独立线程池，避免与 SHARED_EXECUTOR 上的vendor调用互相等待
+    with ThreadPoolExecutor(max_workers=min(8, len(unique_symbols)), thread_name_prefix="tech-batch") as pool:
+        reports = dict(zip(unique_symbols, pool.map(
+            lambda symbol: get_technical_indicators_data.func(symbol, curr_date, look_back_days),
+            unique_symbols
+        )))
+    
+    return "\n---\n\n".join(reports[symbol] for symbol in unique_symbols)
+
 # ==================== 辅助函数和测试代码 ====================
 
+_MA_PERIODS_TEXT = ','.join(map(str, MA_PERIODS))
+_AVAILABLE_INDICATORS = (
+    "RSI - 相对强弱指数",
+    "MACD - 指数平滑异同移动平均线",
+    f"SMA_N - 简单移动平均线 (N={_MA_PERIODS_TEXT})",
+    f"EMA_N - 指数移动平均线 (N={_MA_PERIODS_TEXT})",
+    "BB_Upper - 布林带上轨",
+    "BB_Middle - 布林中轨",
+    "BB_Lower - 布林带下轨",
+    "BB_Width - 布林带宽度",
+    "BB_Position - 布林带位置",
+    "Stoch_K - 随机指标K线",
+    "Stoch_D - 随机指标D线",
+    "ATR - 平均真实波幅"
+)
+
 def list_available_indicators() -> List[str]:
-    """列出所有可用的技术指标"""
-    return [
-        "RSI - 相对强弱指数",
-        "MACD - 指数平滑异同移动平均线",
-        "SMA_N - 简单移动平均线 (N=5,10,20,50,200)",
-        "EMA_N - 指数移动平均线 (N=5,10,20,50,200)",
-        "BB_Upper - 布林带上轨",
-        "BB_Middle - 布林中轨",
-        "BB_Lower - 布林带下轨",
-        "BB_Width - 布林带宽度",
-        "BB_Position - 布林带位置",
-        "Stoch_K - 随机指标K线",
-        "Stoch_D - 随机指标D线",
-        "ATR - 平均真实波幅"
-    ]
+    """列出所有可用的技术指标（返回新列表，调用方可自由修改）"""
+    return list(_AVAILABLE_INDICATORS)
 
 def test_technical_tools():
     """测试技术指标工具"""